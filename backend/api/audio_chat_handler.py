@@ -13,6 +13,19 @@ from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+# Shared OpenAI clients keyed by API key, so each request reuses the same
+# HTTP connection pool instead of opening a new one
+_clients: Dict[Optional[str], AsyncOpenAI] = {}
+
+
+def _get_client() -> AsyncOpenAI:
+    """Get (or lazily create) the shared OpenAI client for the current API key."""
+    api_key = os.getenv("OPENAI_API_KEY")
+    client = _clients.get(api_key)
+    if client is None:
+        client = _clients[api_key] = AsyncOpenAI(api_key=api_key)
+    return client
+
 
 class AudioChatHandler:
     """Handles non-realtime audio chat using OpenAI Chat Completions API."""
@@ -65,7 +78,7 @@ class AudioChatHandler:
         """
         self.model = model
         self.voice = voice
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = _get_client()
 
     async def send_audio_message(
         self,
@@ -13,10 +13,11 @@ Architecture:
 
 import asyncio
 import logging
-import uuid
+import secrets
+from collections import deque
 from dataclasses import dataclass, field
 from fractions import Fraction
-from typing import Awaitable, Callable, Dict, Optional, Set
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
 
 import numpy as np
 from aiortc import RTCPeerConnection, RTCSessionDescription, MediaStreamTrack
@@ -35,12 +36,31 @@ class AudioFrameSourceTrack(MediaStreamTrack):
 
     kind = "audio"
 
+    # About 1.3s of audio at 20ms frames
+    MAX_BUFFERED_FRAMES = 64
+
     def __init__(self, sample_rate: int = 48000):
         super().__init__()
         self.sample_rate = sample_rate
-        self.queue: asyncio.Queue[AudioFrame] = asyncio.Queue()
+        # Single producer (send_frame) and single consumer (recv): a deque
+        # plus one reusable Event avoids a Future per frame. Bounded so a
+        # stalled browser drops the oldest audio instead of building latency.
+        self._frames: Deque[AudioFrame] = deque(maxlen=self.MAX_BUFFERED_FRAMES)
+        self._frame_ready = asyncio.Event()
         self._timestamp = 0
         self._frame_count = 0
+        self._resampler: Optional[AudioResampler] = None
+        self._resampler_key: Optional[tuple] = None
+        self._time_base_rate = sample_rate
+        self._time_base = Fraction(1, sample_rate)
+
+    def _get_resampler(self, frame: AudioFrame) -> AudioResampler:
+        """Return the cached mono resampler, rebuilding it if the input format changed."""
+        key = (frame.sample_rate, frame.layout.name, frame.format.name)
+        if self._resampler is None or self._resampler_key != key:
+            self._resampler = AudioResampler(format="s16", layout="mono")
+            self._resampler_key = key
+        return self._resampler
 
     def _to_mono(self, frame: AudioFrame) -> AudioFrame:
         """Convert frame to mono with proper timestamps."""
@@ -48,41 +68,52 @@ class AudioFrameSourceTrack(MediaStreamTrack):
             if frame.layout.name == "mono":
                 mono = frame
             else:
-                resampler = AudioResampler(format="s16", layout="mono")
-                mono_frames = resampler.resample(frame)
-                mono = next(iter(mono_frames))
-
-            sr = getattr(frame, "sample_rate", None) or self.sample_rate
+                mono_frames = self._get_resampler(frame).resample(frame)
+                mono = mono_frames[0] if mono_frames else frame
+
+            sr = frame.sample_rate or self.sample_rate
+            # The rate is fixed for a stream; only build a new Fraction when it changes
+            if sr != self._time_base_rate:
+                self._time_base_rate = sr
+                self._time_base = Fraction(1, sr)
             mono.sample_rate = sr
-            mono.time_base = Fraction(1, sr)
+            mono.time_base = self._time_base
             mono.pts = self._timestamp
             self._timestamp += mono.samples
 
             return mono
         except Exception as exc:
-            logger.error(f"Failed to normalize audio frame: {exc}")
+            logger.error("Failed to normalize audio frame: %s", exc)
             return frame
 
     async def send_frame(self, frame: AudioFrame) -> None:
         """Queue a frame for sending to the browser."""
         self._frame_count += 1
-        await self.queue.put(self._to_mono(frame))
+        self._frames.append(self._to_mono(frame))
+        self._frame_ready.set()
 
     async def recv(self) -> AudioFrame:
         """Called by aiortc to get the next frame."""
-        return await self.queue.get()
+        frames = self._frames
+        while not frames:
+            self._frame_ready.clear()
+            await self._frame_ready.wait()
+        return frames.popleft()
 
 
-@dataclass
+@dataclass(slots=True)
 class BrowserConnection:
-    """Represents a single browser WebRTC connection."""
+    """Represents a single browser WebRTC connection.
+
+    Slotted, since connections are touched for every broadcast audio frame.
+    """
 
     connection_id: str
     conversation_id: str
     pc: RTCPeerConnection
     audio_source: AudioFrameSourceTrack
     audio_forward_task: Optional[asyncio.Task] = None
-    created_at: float = field(default_factory=lambda: asyncio.get_event_loop().time())
+    created_at: float = field(default_factory=lambda: asyncio.get_running_loop().time())
 
     async def send_audio(self, frame: AudioFrame) -> None:
         """Send audio frame to this browser."""
@@ -129,6 +160,7 @@ class BrowserConnectionManager:
         self.conversation_id = conversation_id
         self.on_browser_audio = on_browser_audio
         self._connections: Dict[str, BrowserConnection] = {}
+        self._connection_ids_snapshot: Tuple[str, ...] = ()
         self._lock = asyncio.Lock()
 
     @property
@@ -141,6 +173,19 @@ class BrowserConnectionManager:
         """Set of active connection IDs."""
         return set(self._connections.keys())
 
+    @property
+    def connection_ids_snapshot(self) -> Tuple[str, ...]:
+        """Immutable snapshot of active connection IDs.
+
+        Rebuilt only when connections are added or removed, so frequent
+        readers (e.g. status polling) don't copy the ID set on every call.
+        """
+        return self._connection_ids_snapshot
+
+    def _refresh_snapshot(self) -> None:
+        """Rebuild the connection ID snapshot. Call with self._lock held."""
+        self._connection_ids_snapshot = tuple(self._connections)
+
     async def add_connection(self, offer_sdp: str) -> tuple[str, str]:
         """
         Add a new browser connection.
@@ -151,7 +196,7 @@ class BrowserConnectionManager:
         Returns:
             Tuple of (connection_id, answer_sdp)
         """
-        connection_id = str(uuid.uuid4())
+        connection_id = secrets.token_hex(16)
         logger.info(f"[BrowserMgr {self.conversation_id}] Adding connection {connection_id[:8]}...")
 
         # Create peer connection
@@ -164,18 +209,24 @@ class BrowserConnectionManager:
         # Set up track handler for receiving browser audio
         audio_forward_task = None
 
+        def start_forwarding(track: MediaStreamTrack) -> None:
+            """Forward the first audio track only, whichever path finds it first."""
+            nonlocal audio_forward_task
+            if track.kind != "audio" or audio_forward_task is not None:
+                return
+            audio_forward_task = asyncio.create_task(
+                self._forward_browser_audio(connection_id, track)
+            )
+            # Store task reference in connection
+            conn = self._connections.get(connection_id)
+            if conn:
+                conn.audio_forward_task = audio_forward_task
+
         @pc.on("track")
         def on_track(track: MediaStreamTrack):
-            nonlocal audio_forward_task
             if track.kind == "audio":
                 logger.info(f"[BrowserMgr {self.conversation_id}] Audio track from {connection_id[:8]}")
-                audio_forward_task = asyncio.create_task(
-                    self._forward_browser_audio(connection_id, track)
-                )
-                # Store task reference in connection
-                conn = self._connections.get(connection_id)
-                if conn:
-                    conn.audio_forward_task = audio_forward_task
+            start_forwarding(track)
 
         @pc.on("connectionstatechange")
         async def on_state_change():
@@ -189,14 +240,13 @@ class BrowserConnectionManager:
         await pc.setRemoteDescription(RTCSessionDescription(sdp=offer_sdp, type="offer"))
 
         # Check for existing tracks (some browsers include them before ontrack fires)
-        for transceiver in pc.getTransceivers():
-            if transceiver.receiver and transceiver.receiver.track:
-                track = transceiver.receiver.track
-                if track.kind == "audio" and audio_forward_task is None:
+        if audio_forward_task is None:
+            for transceiver in pc.getTransceivers():
+                track = transceiver.receiver.track if transceiver.receiver else None
+                if track is not None and track.kind == "audio":
                     logger.info(f"[BrowserMgr {self.conversation_id}] Found existing audio track")
-                    audio_forward_task = asyncio.create_task(
-                        self._forward_browser_audio(connection_id, track)
-                    )
+                    start_forwarding(track)
+                    break
 
         # Create and send answer
         answer = await pc.createAnswer()
@@ -216,6 +266,7 @@ class BrowserConnectionManager:
 
         async with self._lock:
             self._connections[connection_id] = connection
+            self._refresh_snapshot()
 
         logger.info(f"[BrowserMgr {self.conversation_id}] ✅ Connection {connection_id[:8]} added (total: {self.connection_count})")
 
@@ -233,6 +284,8 @@ class BrowserConnectionManager:
         """
         async with self._lock:
             connection = self._connections.pop(connection_id, None)
+            if connection:
+                self._refresh_snapshot()
 
         if connection:
             await connection.close()
@@ -271,19 +324,25 @@ class BrowserConnectionManager:
                 frame = await track.recv()
                 frame_count += 1
 
-                # Log first frame and periodic stats
-                if frame_count == 1:
+                # Log the first frame once; periodic stats only at DEBUG
+                if frame_count == 1 and logger.isEnabledFor(logging.INFO):
                     array = frame.to_ndarray()
-                    logger.info(f"[BrowserMgr {self.conversation_id}] First frame from {connection_id[:8]}:")
-                    logger.info(f"  samples={frame.samples}, rate={frame.sample_rate}, layout={frame.layout.name}")
-                    logger.info(f"  Array shape: {array.shape}, non-zero: {np.count_nonzero(array)}/{array.size}")
-
-                if frame_count % 100 == 0:
-                    logger.debug(f"[BrowserMgr {self.conversation_id}] Forwarded {frame_count} frames from {connection_id[:8]}")
+                    logger.info(
+                        "[BrowserMgr %s] First frame from %.8s: samples=%d, rate=%s, layout=%s, "
+                        "shape=%s, non-zero=%d/%d",
+                        self.conversation_id, connection_id, frame.samples, frame.sample_rate,
+                        frame.layout.name, array.shape, np.count_nonzero(array), array.size,
+                    )
+                elif frame_count % 100 == 0 and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "[BrowserMgr %s] Forwarded %d frames from %.8s",
+                        self.conversation_id, frame_count, connection_id,
+                    )
 
                 # Forward to OpenAI session
-                if self.on_browser_audio:
-                    await self.on_browser_audio(frame)
+                on_browser_audio = self.on_browser_audio
+                if on_browser_audio is not None:
+                    await on_browser_audio(frame)
 
         except asyncio.CancelledError:
             logger.info(f"[BrowserMgr {self.conversation_id}] Audio forwarding stopped for {connection_id[:8]} after {frame_count} frames")
@@ -295,12 +354,15 @@ class BrowserConnectionManager:
         async with self._lock:
             connections = list(self._connections.values())
             self._connections.clear()
+            self._refresh_snapshot()
 
-        for conn in connections:
-            try:
-                await conn.close()
-            except Exception as exc:
-                logger.error(f"Error closing connection {conn.connection_id}: {exc}")
+        results = await asyncio.gather(
+            *(conn.close() for conn in connections),
+            return_exceptions=True,
+        )
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error("Error closing connection %s: %s", conn.connection_id, result)
 
         logger.info(f"[BrowserMgr {self.conversation_id}] All connections closed")
 
@@ -11,19 +11,24 @@ This client manages:
 """
 
 import asyncio
-import json
 import logging
 from fractions import Fraction
 from typing import Callable, Dict, List, Optional
 
 import aiohttp
 import numpy as np
+import orjson
 from aiortc import RTCPeerConnection, RTCSessionDescription, MediaStreamTrack
 from av import AudioFrame, AudioResampler
 import wave
 
 logger = logging.getLogger(__name__)
 
+
+def _dumps(obj) -> str:
+    """Encode a data channel payload as a JSON string (sent as a text message)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
 # ============================================================================
 # Audio Track (Outbound to OpenAI)
 # ============================================================================
@@ -49,6 +54,9 @@ class AudioTrack(MediaStreamTrack):
         self._timestamp = 0
         self._sample_rate = sample_rate
         self.input_gain = input_gain
+        # Mono resampler reused across frames, keyed by input (rate, layout, format)
+        self._resampler: Optional[AudioResampler] = None
+        self._resampler_key: Optional[tuple] = None
         # Debug recording
         self._debug_audio_path = debug_audio_path
         self._debug_wave: Optional[wave.Wave_write] = None
@@ -60,6 +68,14 @@ class AudioTrack(MediaStreamTrack):
         """Called by aiortc to get next audio frame"""
         return await self.queue.get()
 
+    def _get_resampler(self, frame: AudioFrame, rate: int) -> AudioResampler:
+        """Return the cached mono resampler, rebuilding it if the input format changed."""
+        key = (rate, frame.layout.name, frame.format.name)
+        if self._resampler is None or self._resampler_key != key:
+            self._resampler = AudioResampler(format="s16", layout="mono", rate=rate)
+            self._resampler_key = key
+        return self._resampler
+
     def _ensure_frame(self, audio_data) -> AudioFrame:
         """Normalize incoming audio to AudioFrame with correct timing"""
         # Handle AudioFrame input
@@ -69,8 +85,7 @@ class AudioTrack(MediaStreamTrack):
             # If stereo (or not mono), resample to mono to avoid doubled sample counts (slow-mo)
             if getattr(frame_in, "layout", None) and getattr(frame_in.layout, "name", "") != "mono":
                 try:
-                    resampler = AudioResampler(format="s16", layout="mono", rate=incoming_sr)
-                    frame_in = next(iter(resampler.resample(frame_in)))
+                    frame_in = next(iter(self._get_resampler(frame_in, incoming_sr).resample(frame_in)))
                 except Exception as exc:
                     logger.error(f"[AudioTrack] Resample to mono failed, falling back: {exc}")
             sample_rate = getattr(frame_in, "sample_rate", None) or incoming_sr
@@ -80,10 +95,13 @@ class AudioTrack(MediaStreamTrack):
             sample_rate = self._sample_rate
             array = np.frombuffer(audio_data, dtype=np.int16).reshape(1, -1)
 
-        # Apply input gain to boost mic level for VAD/transcription
+        # Apply input gain to boost mic level for VAD/transcription.
+        # Scale into a single float32 buffer and clip it in place, avoiding the
+        # int32 copy and float64 temporaries of the naive expression.
         if self.input_gain and self.input_gain != 1.0:
-            boosted = np.clip(array.astype(np.int32) * self.input_gain, -30000, 30000).astype(np.int16)
-            array = boosted
+            scaled = np.multiply(array, self.input_gain, dtype=np.float32)
+            np.clip(scaled, -30000, 30000, out=scaled)
+            array = scaled.astype(np.int16)
 
         # Create frame with proper timing
         frame = AudioFrame.from_ndarray(array, format="s16", layout="mono")
@@ -148,6 +166,7 @@ class OpenAIWebRTCClient:
         voice: str = "alloy",
         system_prompt: Optional[str] = None,
         tools: Optional[List[Dict]] = None,
+        tools_json: Optional[bytes] = None,
         modalities: Optional[List[str]] = None,
         on_audio_callback: Optional[Callable] = None,
         on_function_call_callback: Optional[Callable] = None,
@@ -168,6 +187,8 @@ class OpenAIWebRTCClient:
             voice: Voice name (e.g., "alloy", "echo", "shimmer")
             system_prompt: System instructions for the model
             tools: List of tool/function definitions
+            tools_json: Optional pre-encoded JSON of ``tools``, spliced into
+                session.update as-is instead of being re-encoded
             modalities: ["audio", "text"] - supported modalities
             on_audio_callback: Called when audio received from OpenAI
             on_function_call_callback: Called when function call received
@@ -182,6 +203,7 @@ class OpenAIWebRTCClient:
         self.voice = voice
         self.system_prompt = system_prompt
         self.tools = tools or []
+        self.tools_json = tools_json
         self.modalities = modalities or ["audio", "text"]
         self.enable_server_vad = enable_server_vad
         self.enable_input_transcription = enable_input_transcription
@@ -323,7 +345,7 @@ class OpenAIWebRTCClient:
         @channel.on("message")
         def on_message(message):
             try:
-                event = json.loads(message)
+                event = orjson.loads(message)
                 self._handle_event(event)
             except Exception as e:
                 logger.error(f"[OpenAI Client] Error handling message: {e}")
@@ -353,7 +375,9 @@ class OpenAIWebRTCClient:
 
         # Configure tools
         if self.tools:
-            session_config["tools"] = self.tools
+            session_config["tools"] = (
+                orjson.Fragment(self.tools_json) if self.tools_json is not None else self.tools
+            )
             logger.info(f"[OpenAI Client]    Registering {len(self.tools)} tools")
         else:
             logger.info("[OpenAI Client]    No tools registered")
@@ -516,11 +540,12 @@ class OpenAIWebRTCClient:
         event_type = event.get("type")
 
         # Log all events for debugging
-        logger.info(f"[OpenAI Client] 📨 Received event: {event_type}")
+        logger.info("[OpenAI Client] 📨 Received event: %s", event_type)
 
         # Log important event details
         if event_type and "response" in event_type:
-            logger.info(f"[OpenAI Client]    Response event: {json.dumps(event)[:200]}...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[OpenAI Client]    Response event: %.200s...", _dumps(event))
         elif event_type == "session.updated":
             logger.info("[OpenAI Client]    ✅ Session configuration confirmed by OpenAI")
         elif event_type == "input_audio_buffer.speech_started":
@@ -548,7 +573,7 @@ class OpenAIWebRTCClient:
             return
 
         try:
-            self.data_channel.send(json.dumps(event))
+            self.data_channel.send(_dumps(event))
         except Exception as e:
             logger.error(f"[OpenAI Client] Error sending event: {e}")
             raise
@@ -609,7 +634,7 @@ class OpenAIWebRTCClient:
             "item": {
                 "type": "function_call_output",
                 "call_id": call_id,
-                "output": json.dumps(result),
+                "output": _dumps(result),
             },
         })
 
@@ -665,7 +690,7 @@ class OpenAIWebRTCClient:
             },
         })
 
-        logger.info(f"[OpenAI Client] Forwarded {role} message to voice: {content[:50]}...")
+        logger.info("[OpenAI Client] Forwarded %s message to voice: %.50s...", role, content)
 
     async def send_function_call_result(self, call_id: str, result: Dict):
         """
@@ -684,7 +709,7 @@ class OpenAIWebRTCClient:
             "item": {
                 "type": "function_call_output",
                 "call_id": call_id,
-                "output": json.dumps(result),
+                "output": _dumps(result),
             },
         })
 
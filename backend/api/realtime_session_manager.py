@@ -11,35 +11,51 @@ Architecture:
 """
 
 import asyncio
-import json
 import logging
 import os
-import uuid
+import secrets
+import sys
 from typing import Callable, Dict, List, Optional
 
 import aiohttp
 import numpy as np
+import orjson
 from av import AudioFrame
 
 from .openai_webrtc_client import OpenAIWebRTCClient
 
 try:
-    from .realtime_voice import VOICE_SYSTEM_PROMPT, stream_manager, prepare_voice_system_prompt
+    from .realtime_voice import VOICE_SYSTEM_PROMPT, stream_manager, prepare_voice_system_prompt, encode_event_frame
 except Exception:
     VOICE_SYSTEM_PROMPT = "You are a realtime voice assistant."
     stream_manager = None
     prepare_voice_system_prompt = None
+    encode_event_frame = None
 
 try:
-    from ..utils.voice_conversation_store import store as conversation_store
+    from ..utils.voice_conversation_store import store as conversation_store, run_store_call
 except ImportError:
-    from utils.voice_conversation_store import store as conversation_store
+    from utils.voice_conversation_store import store as conversation_store, run_store_call
 
 logger = logging.getLogger(__name__)
 
+# Process-wide settings, read once at import (main.py loads .env before
+# mounting the realtime routers)
+BACKEND_WS_URL = os.getenv("BACKEND_WS_URL", "ws://localhost:8000")
+VOICE_INPUT_GAIN = float(os.getenv("VOICE_INPUT_GAIN", "4.0"))
 
-# Tool definitions for OpenAI Realtime API
-REALTIME_TOOLS = [
+# Buffered OpenAI events are persisted after this many seconds, or as soon
+# as this many have accumulated
+EVENT_FLUSH_INTERVAL = 0.05
+EVENT_FLUSH_MAX_EVENTS = 64
+
+# Maximum number of event batches waiting for a session's persistence worker
+EVENT_QUEUE_MAXSIZE = 1024
+
+
+# Tool definitions for OpenAI Realtime API (a tuple, so the shared
+# definitions can't be appended to by a session)
+REALTIME_TOOLS = (
     {
         "type": "function",
         "name": "send_to_nested",
@@ -87,38 +103,147 @@ REALTIME_TOOLS = [
         "name": "pause_claude_code",
         "description": "Pause or interrupt the currently running Claude Code task.",
         "parameters": {"type": "object", "properties": {}}
-    }
-]
+    },
+)
+
+# The tool schema never changes, so encode it once for every session.update
+REALTIME_TOOLS_JSON = orjson.dumps(REALTIME_TOOLS)
+
+
+def _encode_control_message(message: Dict) -> str:
+    """Encode a message for an agent runner WebSocket.
+
+    Sent as a text frame, since the runner reads it with receive_json().
+    """
+    return orjson.dumps(message).decode()
+
+
+_CANCEL_MESSAGE = _encode_control_message({"type": "cancel"})
+
+
+# Shared HTTP session for agent WebSocket connections. Every session and
+# disconnected-mode tool call reuses its connection pool and DNS cache
+# instead of building a new connector.
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_lock = asyncio.Lock()
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get (or lazily create) the shared aiohttp session."""
+    global _http_session
+    async with _http_session_lock:
+        if _http_session is None or _http_session.closed:
+            _http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                )
+            )
+        return _http_session
+
+
+# ws_connect options for the local agent runner WebSockets. Loopback traffic
+# gains nothing from permessage-deflate, and the heartbeat lets listeners
+# notice a dead runner instead of waiting forever.
+AGENT_WS_OPTIONS = {
+    "compress": 0,
+    "heartbeat": 30.0,
+    "max_msg_size": 8 * 1024 * 1024,
+}
+
+
+async def close_http_session() -> None:
+    """Close the shared aiohttp session."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+# ============================================================================
+# Agent Event Summaries
+# ============================================================================
+
+def _format_text_message(prefix: str, agent: str, data: Dict) -> str:
+    return f"{prefix} {agent}] {data.get('content', '')}"
+
+
+def _format_tool_call_request(prefix: str, agent: str, data: Dict) -> str:
+    return f"{prefix} {agent}] Requesting tool: {data.get('name', 'Tool')}"
+
+
+def _format_tool_call_execution(prefix: str, agent: str, data: Dict) -> str:
+    tool_name = data.get("name") or "Tool"
+    # Check for content array (AutoGen format)
+    content_items = data.get("content")
+    if isinstance(content_items, list) and content_items:
+        tool_name = content_items[0].get("name", tool_name)
+    result_text = str(data.get("result", ""))[:200]
+    return f"{prefix} {tool_name}] {result_text}" if result_text else f"{prefix} {tool_name}] completed"
+
+
+def _format_task_result(prefix: str, agent: str, data: Dict) -> str:
+    return f"{prefix}] Task {data.get('outcome', 'completed')}: {data.get('message', '')}"
+
+
+def _format_system(prefix: str, agent: str, data: Dict) -> str:
+    return f"{prefix} System] {data.get('message', '')}"
+
+
+# Message summary builders keyed by (lowercased) agent event type
+_AGENT_EVENT_FORMATTERS = {
+    "textmessage": _format_text_message,
+    "toolcallrequestevent": _format_tool_call_request,
+    "toolcallexecutionevent": _format_tool_call_execution,
+    "taskresult": _format_task_result,
+    "system": _format_system,
+}
+
+# Raw agent event type (e.g. "TextMessage") -> interned lowercase form. The
+# set of upstream types is small, so this saves a str.lower() per event;
+# the cap keeps unexpected types from growing it without bound.
+_EVENT_TYPE_CACHE: Dict[str, str] = {}
+_EVENT_TYPE_CACHE_MAX = 256
+
+
+def normalize_event_type(raw: str) -> str:
+    """Return the lowercase form of an agent event type, cached per raw value."""
+    event_type = _EVENT_TYPE_CACHE.get(raw)
+    if event_type is None:
+        event_type = sys.intern(raw.lower())
+        if len(_EVENT_TYPE_CACHE) < _EVENT_TYPE_CACHE_MAX:
+            _EVENT_TYPE_CACHE[raw] = event_type
+    return event_type
+
 
+def format_agent_event(prefix: str, agent: str, event_type: str, data: Dict) -> str:
+    """Build the one-line summary of a nested/Claude Code event sent to the voice model."""
+    formatter = _AGENT_EVENT_FORMATTERS.get(event_type)
+    if formatter is None:
+        # Forward unknown event types too
+        return f"{prefix} {agent}] {event_type}"
+    return formatter(prefix, agent, data)
 
-async def _append_and_broadcast(
-    conversation_id: str,
-    payload: Dict,
-    source: str = "voice",
-    event_type: Optional[str] = None,
-) -> None:
-    """Record an event to the conversation store and broadcast to subscribers."""
+
+async def _append_many_and_broadcast(conversation_id: str, events: List) -> None:
+    """Record (payload, source, event_type) events in one write and broadcast each."""
     try:
-        record = conversation_store.append_event(
-            conversation_id,
-            payload,
-            source=source,
-            event_type=event_type,
-        )
+        records = await run_store_call(conversation_store.append_events, conversation_id, events)
     except Exception as exc:
-        logger.error("Failed to append voice event: %s", exc)
+        logger.error("Failed to append %d voice events: %s", len(events), exc)
         return
 
-    if not stream_manager:
+    if not (stream_manager and encode_event_frame):
         return
 
-    try:
-        await stream_manager.broadcast(
-            conversation_id,
-            {"type": "event", "event": record},
-        )
-    except Exception as exc:
-        logger.error("Failed to broadcast voice event: %s", exc)
+    # Same single orjson encode per record as the disconnected-mode writer
+    for record in records:
+        try:
+            await stream_manager.broadcast_raw(conversation_id, encode_event_frame(record))
+        except Exception as exc:
+            logger.error("Failed to broadcast voice event: %s", exc)
 
 
 class OpenAISession:
@@ -141,7 +266,7 @@ class OpenAISession:
         model: str = "gpt-realtime",
         on_audio_callback: Optional[Callable[[AudioFrame], None]] = None,
     ):
-        self.session_id = str(uuid.uuid4())
+        self.session_id = secrets.token_hex(16)
         self.conversation_id = conversation_id
         self.voice = voice
         self.agent_name = agent_name
@@ -159,16 +284,27 @@ class OpenAISession:
         self.claude_code_ws: Optional[aiohttp.ClientWebSocketResponse] = None
         self.nested_ws_task: Optional[asyncio.Task] = None
         self.claude_code_ws_task: Optional[asyncio.Task] = None
-        self.aiohttp_session: Optional[aiohttp.ClientSession] = None
 
         # Configuration
-        self.backend_base_url = os.getenv("BACKEND_WS_URL", "ws://localhost:8000")
-        self.input_gain = float(os.getenv("VOICE_INPUT_GAIN", "4.0"))
+        self.backend_base_url = BACKEND_WS_URL
+        self.input_gain = VOICE_INPUT_GAIN
 
         # State
         self._connected = False
         self._closing = False
 
+        # OpenAI data channel events waiting to be persisted as one batch
+        self._event_buffer: List = []
+        self._event_flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Event batches are stored and broadcast by a background worker, so
+        # tool calls and agent listeners never wait on the store or on slow
+        # subscribers
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+        self._event_task: Optional[asyncio.Task] = None
+        self._event_worker_stopped = False
+        self._dropped_event_batches = 0
+
     async def connect(self) -> None:
         """Establish connection to OpenAI Realtime API."""
         if self._connected:
@@ -189,6 +325,7 @@ class OpenAISession:
             model=self.model,
             voice=self.voice,
             tools=REALTIME_TOOLS,
+            tools_json=REALTIME_TOOLS_JSON,
             on_audio_callback=self._handle_openai_audio,
             on_function_call_callback=self._handle_function_call,
             on_event_callback=self._handle_openai_event,
@@ -204,8 +341,7 @@ class OpenAISession:
 
         self._connected = True
 
-        await _append_and_broadcast(
-            self.conversation_id,
+        self._record_event(
             {
                 "type": "session_started",
                 "session_id": self.session_id,
@@ -243,13 +379,6 @@ class OpenAISession:
                 except Exception as exc:
                     logger.error(f"Error closing WebSocket: {exc}")
 
-        # Close aiohttp session
-        if self.aiohttp_session:
-            try:
-                await self.aiohttp_session.close()
-            except Exception as exc:
-                logger.error(f"Error closing aiohttp session: {exc}")
-
         # Close OpenAI client
         if self.openai_client:
             try:
@@ -259,12 +388,13 @@ class OpenAISession:
 
         self._connected = False
 
-        await _append_and_broadcast(
-            self.conversation_id,
+        # Record the stop after any buffered events and let the queue drain
+        self._record_event(
             {"type": "session_stopped", "session_id": self.session_id},
             source="controller",
             event_type="session_stopped",
         )
+        await self._stop_event_worker()
 
         logger.info(f"[OpenAISession {self.conversation_id}] Closed")
 
@@ -278,13 +408,17 @@ class OpenAISession:
 
     async def _handle_openai_audio(self, frame: AudioFrame) -> None:
         """Handle audio from OpenAI and broadcast to frontends."""
-        if self.on_audio_callback:
-            await self.on_audio_callback(frame)
+        callback = self.on_audio_callback
+        if callback is not None:
+            await callback(frame)
 
     async def send_audio(self, frame: AudioFrame) -> None:
         """Send audio from a frontend to OpenAI."""
-        if self.openai_client and self.is_connected:
-            await self.openai_client.send_audio_frame(frame)
+        # Called for every browser frame: bind locals instead of going
+        # through the is_connected property
+        client = self.openai_client
+        if client is not None and self._connected and not self._closing:
+            await client.send_audio_frame(frame)
 
     async def send_text(self, text: str) -> None:
         """Send text message to OpenAI."""
@@ -304,14 +438,91 @@ class OpenAISession:
 
     def _handle_openai_event(self, event: Dict) -> None:
         """Handle events from OpenAI data channel."""
-        asyncio.create_task(
-            _append_and_broadcast(
-                self.conversation_id,
-                event,
-                source="voice",
-                event_type=event.get("type"),
+        # Deltas and transcripts arrive at realtime cadence; buffer them and
+        # persist in batches instead of one store write per event
+        buffer = self._event_buffer
+        buffer.append((event, "voice", event.get("type")))
+        if len(buffer) >= EVENT_FLUSH_MAX_EVENTS:
+            self._flush_events()
+        elif self._event_flush_handle is None:
+            self._event_flush_handle = asyncio.get_running_loop().call_later(
+                EVENT_FLUSH_INTERVAL, self._flush_events
             )
-        )
+
+    def _take_buffered_events(self) -> List:
+        """Detach the buffered events and cancel any pending flush."""
+        if self._event_flush_handle is not None:
+            self._event_flush_handle.cancel()
+            self._event_flush_handle = None
+        events, self._event_buffer = self._event_buffer, []
+        return events
+
+    def _flush_events(self) -> None:
+        """Persist and broadcast buffered OpenAI events in the background."""
+        events = self._take_buffered_events()
+        if events:
+            self._record_events(events)
+
+    def _record_event(self, payload: Dict, source: str, event_type: Optional[str]) -> None:
+        """Queue an event for persistence, after any buffered OpenAI events."""
+        events = self._take_buffered_events()
+        events.append((payload, source, event_type))
+        self._record_events(events)
+
+    def _record_events(self, events: List) -> None:
+        """Queue a batch of (payload, source, event_type) events for the persistence worker."""
+        if self._event_worker_stopped:
+            return
+        if self._event_task is None or self._event_task.done():
+            self._event_task = asyncio.create_task(self._drain_events())
+        try:
+            self._event_queue.put_nowait(events)
+        except asyncio.QueueFull:
+            # Warn on the first drop and then every 100th, so a stalled store
+            # doesn't also flood the log at realtime event rate
+            self._dropped_event_batches += 1
+            if self._dropped_event_batches % 100 == 1:
+                logger.warning(
+                    "[OpenAISession %s] Event queue full, dropped %d event batches so far",
+                    self.conversation_id, self._dropped_event_batches,
+                )
+
+    async def _drain_events(self) -> None:
+        """Store and broadcast queued event batches in order."""
+        queue = self._event_queue
+        while True:
+            # Coalesce everything queued since the last write into one
+            # store transaction
+            events = list(await queue.get())
+            batches = 1
+            while not queue.empty():
+                events.extend(queue.get_nowait())
+                batches += 1
+            try:
+                await _append_many_and_broadcast(self.conversation_id, events)
+            finally:
+                for _ in range(batches):
+                    queue.task_done()
+
+    async def _stop_event_worker(self) -> None:
+        """Wait briefly for queued events to be stored, then stop the worker."""
+        self._event_worker_stopped = True
+        task = self._event_task
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(self._event_queue.join(), timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "[OpenAISession %s] %d event batches not persisted on close",
+                self.conversation_id, self._event_queue.qsize(),
+            )
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._event_task = None
 
     async def _handle_function_call(self, event: Dict) -> None:
         """Handle function calls from OpenAI."""
@@ -320,16 +531,15 @@ class OpenAISession:
         arguments_str = event.get("arguments", "{}")
 
         try:
-            arguments = json.loads(arguments_str) if isinstance(arguments_str, str) else arguments_str
-        except json.JSONDecodeError:
+            arguments = orjson.loads(arguments_str) if isinstance(arguments_str, str) else arguments_str
+        except orjson.JSONDecodeError:
             logger.error(f"[Tool Call] Failed to parse arguments: {arguments_str}")
             arguments = {}
 
         logger.info(f"[Tool Call] Executing: {tool_name} with args: {arguments}")
 
         # Record the function call
-        await _append_and_broadcast(
-            self.conversation_id,
+        self._record_event(
             {"type": "function_call", "tool": tool_name, "arguments": arguments, "call_id": call_id},
             source="voice",
             event_type="function_call",
@@ -347,8 +557,7 @@ class OpenAISession:
             await self.openai_client.send_function_call_result(call_id, result)
 
         # Record the result
-        await _append_and_broadcast(
-            self.conversation_id,
+        self._record_event(
             {"type": "function_result", "tool": tool_name, "result": result, "call_id": call_id},
             source="voice",
             event_type="function_result",
@@ -356,18 +565,10 @@ class OpenAISession:
 
     async def _execute_tool(self, call_id: str, tool_name: str, arguments: Dict) -> Dict:
         """Execute a tool and return result."""
-        if tool_name == "send_to_nested":
-            return await self._tool_send_to_nested(arguments.get("text", ""))
-        elif tool_name == "send_to_claude_code":
-            return await self._tool_send_to_claude_code(arguments.get("text", ""))
-        elif tool_name == "pause":
-            return await self._tool_pause()
-        elif tool_name == "reset":
-            return await self._tool_reset()
-        elif tool_name == "pause_claude_code":
-            return await self._tool_pause_claude_code()
-        else:
+        handler = self._TOOL_HANDLERS.get(tool_name)
+        if handler is None:
             return {"success": False, "error": f"Unknown tool: {tool_name}"}
+        return await handler(self, arguments)
 
     # ========================================================================
     # Tool Implementations
@@ -379,7 +580,7 @@ class OpenAISession:
         if not self.nested_ws or self.nested_ws.closed:
             return {"success": False, "error": "Nested WebSocket not connected"}
         try:
-            await self.nested_ws.send_json({"type": "user_message", "data": text})
+            await self.nested_ws.send_str(_encode_control_message({"type": "user_message", "data": text}))
             logger.info(f"[Tool] Sent to nested agents: {text[:100]}...")
             return {"success": True, "message": f"Sent to nested agents: {text[:100]}..."}
         except Exception as exc:
@@ -391,7 +592,7 @@ class OpenAISession:
         if not self.claude_code_ws or self.claude_code_ws.closed:
             return {"success": False, "error": "Claude Code WebSocket not connected"}
         try:
-            await self.claude_code_ws.send_json({"type": "user_message", "data": text})
+            await self.claude_code_ws.send_str(_encode_control_message({"type": "user_message", "data": text}))
             logger.info(f"[Tool] Sent to Claude Code: {text[:100]}...")
             return {"success": True, "message": f"Sent to Claude Code: {text[:100]}..."}
         except Exception as exc:
@@ -402,7 +603,7 @@ class OpenAISession:
             return {"success": False, "error": "Nested WebSocket not connected"}
         try:
             # Send "cancel" type which the runner's control_listener expects
-            await self.nested_ws.send_json({"type": "cancel"})
+            await self.nested_ws.send_str(_CANCEL_MESSAGE)
             return {"success": True, "message": "Nested agents paused"}
         except Exception as exc:
             return {"success": False, "error": str(exc)}
@@ -412,7 +613,7 @@ class OpenAISession:
             return {"success": False, "error": "Nested WebSocket not connected"}
         try:
             # Send "cancel" to stop the current run - reset is effectively a cancel
-            await self.nested_ws.send_json({"type": "cancel"})
+            await self.nested_ws.send_str(_CANCEL_MESSAGE)
             return {"success": True, "message": "Nested agents reset"}
         except Exception as exc:
             return {"success": False, "error": str(exc)}
@@ -422,22 +623,30 @@ class OpenAISession:
             return {"success": False, "error": "Claude Code WebSocket not connected"}
         try:
             # Send "cancel" type which the runner's control_listener expects
-            await self.claude_code_ws.send_json({"type": "cancel"})
+            await self.claude_code_ws.send_str(_CANCEL_MESSAGE)
             return {"success": True, "message": "Claude Code paused"}
         except Exception as exc:
             return {"success": False, "error": str(exc)}
 
+    # Tool name -> handler(session, arguments)
+    _TOOL_HANDLERS = {
+        "send_to_nested": lambda self, args: self._tool_send_to_nested(args.get("text", "")),
+        "send_to_claude_code": lambda self, args: self._tool_send_to_claude_code(args.get("text", "")),
+        "pause": lambda self, args: self._tool_pause(),
+        "reset": lambda self, args: self._tool_reset(),
+        "pause_claude_code": lambda self, args: self._tool_pause_claude_code(),
+    }
+
     # ========================================================================
     # WebSocket Connections (Nested Agents & Claude Code)
     # ========================================================================
 
     async def _connect_nested_websocket(self) -> None:
         try:
-            if not self.aiohttp_session:
-                self.aiohttp_session = aiohttp.ClientSession()
+            http_session = await get_http_session()
             ws_url = f"{self.backend_base_url}/api/runs/{self.agent_name}"
             logger.info(f"[OpenAISession] Connecting to nested agents at {ws_url}")
-            self.nested_ws = await self.aiohttp_session.ws_connect(ws_url)
+            self.nested_ws = await http_session.ws_connect(ws_url, **AGENT_WS_OPTIONS)
             self.nested_ws_task = asyncio.create_task(self._listen_nested_websocket())
             logger.info("[OpenAISession] Connected to nested agents")
         except Exception as exc:
@@ -446,11 +655,10 @@ class OpenAISession:
 
     async def _connect_claude_code_websocket(self) -> None:
         try:
-            if not self.aiohttp_session:
-                self.aiohttp_session = aiohttp.ClientSession()
+            http_session = await get_http_session()
             ws_url = f"{self.backend_base_url}/api/runs/ClaudeCode"
             logger.info(f"[OpenAISession] Connecting to Claude Code at {ws_url}")
-            self.claude_code_ws = await self.aiohttp_session.ws_connect(ws_url)
+            self.claude_code_ws = await http_session.ws_connect(ws_url, **AGENT_WS_OPTIONS)
             self.claude_code_ws_task = asyncio.create_task(self._listen_claude_code_websocket())
             logger.info("[OpenAISession] Connected to Claude Code")
         except Exception as exc:
@@ -464,9 +672,9 @@ class OpenAISession:
             async for msg in self.nested_ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        event = json.loads(msg.data)
+                        event = orjson.loads(msg.data)
                         await self._handle_nested_message(event)
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         logger.error(f"Invalid JSON from nested agents: {msg.data}")
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     logger.error(f"Nested agents error: {self.nested_ws.exception()}")
@@ -483,9 +691,9 @@ class OpenAISession:
             async for msg in self.claude_code_ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        event = json.loads(msg.data)
+                        event = orjson.loads(msg.data)
                         await self._handle_claude_code_message(event)
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         logger.error(f"Invalid JSON from Claude Code: {msg.data}")
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     logger.error(f"Claude Code error: {self.claude_code_ws.exception()}")
@@ -501,45 +709,21 @@ class OpenAISession:
         Preserves the full original event data for the frontend TeamInsights panel
         while also creating a formatted message for the voice model.
         """
-        event_type = event.get("type", "").lower()
-        event_data = event.get("data", {})
-        message = None
+        event_type = normalize_event_type(event.get("type") or "")
+        event_data = event.get("data") or {}
 
         # Extract agent/source info
         agent = event_data.get("source") or event_data.get("agent") or "Agent"
+        message = format_agent_event("[TEAM", agent, event_type, event_data)
 
-        if event_type == "textmessage":
-            content = event_data.get("content", "")
-            message = f"[TEAM {agent}] {content}"
-        elif event_type == "toolcallrequestevent":
-            tool_name = event_data.get("name", "Tool")
-            message = f"[TEAM {agent}] Requesting tool: {tool_name}"
-        elif event_type == "toolcallexecutionevent":
-            tool_name = event_data.get("name") or "Tool"
-            # Check for content array (AutoGen format)
-            content_items = event_data.get("content", [])
-            if isinstance(content_items, list) and content_items:
-                tool_name = content_items[0].get("name", tool_name)
-            result = str(event_data.get("result", ""))[:200]
-            message = f"[TEAM {tool_name}] {result}" if result else f"[TEAM {tool_name}] completed"
-        elif event_type == "taskresult":
-            outcome = event_data.get("outcome", "completed")
-            summary = event_data.get("message", "")
-            message = f"[TEAM] Task {outcome}: {summary}"
-        elif event_type == "system":
-            sys_message = event_data.get("message", "")
-            message = f"[TEAM System] {sys_message}"
-        else:
-            # Forward unknown event types too
-            message = f"[TEAM {agent}] {event_type}"
-
+        # forward_message_to_voice only queues a frame on the data channel
+        # (aiortc buffers SCTP sends), so it never blocks this listener
         if message and self.openai_client:
-            logger.info(f"[Event Forward] {message[:100]}...")
+            logger.info("[Event Forward] %.100s...", message)
             await self.openai_client.forward_message_to_voice("system", message)
 
         # Broadcast with full original event data for frontend panels
-        await _append_and_broadcast(
-            self.conversation_id,
+        self._record_event(
             {
                 "type": "nested_event",
                 "event_type": event_type,
@@ -559,45 +743,21 @@ class OpenAISession:
         Preserves the full original event data for the frontend ClaudeCodeInsights panel
         while also creating a formatted message for the voice model.
         """
-        event_type = event.get("type", "").lower()
-        event_data = event.get("data", {})
-        message = None
+        event_type = normalize_event_type(event.get("type") or "")
+        event_data = event.get("data") or {}
 
         # Extract source info
         source = event_data.get("source") or event_data.get("agent") or "ClaudeCode"
+        message = format_agent_event("[CODE", source, event_type, event_data)
 
-        if event_type == "textmessage":
-            content = event_data.get("content", "")
-            message = f"[CODE {source}] {content}"
-        elif event_type == "toolcallrequestevent":
-            tool_name = event_data.get("name", "Tool")
-            message = f"[CODE {source}] Requesting tool: {tool_name}"
-        elif event_type == "toolcallexecutionevent":
-            tool_name = event_data.get("name") or "Tool"
-            # Check for content array (AutoGen format)
-            content_items = event_data.get("content", [])
-            if isinstance(content_items, list) and content_items:
-                tool_name = content_items[0].get("name", tool_name)
-            result = str(event_data.get("result", ""))[:200]
-            message = f"[CODE {tool_name}] {result}" if result else f"[CODE {tool_name}] completed"
-        elif event_type == "taskresult":
-            outcome = event_data.get("outcome", "completed")
-            summary = event_data.get("message", "")
-            message = f"[CODE] Task {outcome}: {summary}"
-        elif event_type == "system":
-            sys_message = event_data.get("message", "")
-            message = f"[CODE System] {sys_message}"
-        else:
-            # Forward unknown event types too
-            message = f"[CODE {source}] {event_type}"
-
+        # forward_message_to_voice only queues a frame on the data channel
+        # (aiortc buffers SCTP sends), so it never blocks this listener
         if message and self.openai_client:
-            logger.info(f"[Event Forward] {message[:100]}...")
+            logger.info("[Event Forward] %.100s...", message)
             await self.openai_client.forward_message_to_voice("system", message)
 
         # Broadcast with full original event data for frontend panels
-        await _append_and_broadcast(
-            self.conversation_id,
+        self._record_event(
             {
                 "type": "claude_code_event",
                 "event_type": event_type,
@@ -623,6 +783,8 @@ class RealtimeSessionManager:
     def __init__(self):
         self._sessions: Dict[str, OpenAISession] = {}
         self._lock = asyncio.Lock()
+        # Conversations whose detached session is still closing; set when done
+        self._closing: Dict[str, asyncio.Event] = {}
 
     async def get_or_create_session(
         self,
@@ -649,7 +811,18 @@ class RealtimeSessionManager:
         Returns:
             OpenAISession for the conversation
         """
-        async with self._lock:
+        # Don't start a new session while the previous one is still tearing
+        # down, or both would write events for this conversation
+        while True:
+            closing = self._closing.get(conversation_id)
+            if closing is not None:
+                await closing.wait()
+            await self._lock.acquire()
+            if conversation_id not in self._closing:
+                break
+            self._lock.release()
+
+        try:
             if conversation_id in self._sessions:
                 session = self._sessions[conversation_id]
                 if session.is_connected:
@@ -687,6 +860,8 @@ class RealtimeSessionManager:
             await session.connect()
             self._sessions[conversation_id] = session
             return session
+        finally:
+            self._lock.release()
 
     async def get_session(self, conversation_id: str) -> Optional[OpenAISession]:
         """Get existing session for a conversation (if any)."""
@@ -698,23 +873,36 @@ class RealtimeSessionManager:
 
     async def close_session(self, conversation_id: str) -> bool:
         """Close and remove session for a conversation."""
+        # Detach under the lock, but tear down outside it so other
+        # conversations aren't blocked on this session's close
         async with self._lock:
             session = self._sessions.pop(conversation_id, None)
-            if session:
-                await session.close()
-                return True
-            return False
+            if session is None:
+                return False
+            closed = asyncio.Event()
+            self._closing[conversation_id] = closed
+        try:
+            await session.close()
+        finally:
+            if self._closing.get(conversation_id) is closed:
+                del self._closing[conversation_id]
+            closed.set()
+        return True
 
     async def close_all(self) -> None:
         """Close all sessions (for shutdown)."""
         async with self._lock:
-            for session in self._sessions.values():
-                try:
-                    await session.close()
-                except Exception as exc:
-                    logger.error(f"Error closing session: {exc}")
+            sessions = list(self._sessions.values())
             self._sessions.clear()
 
+        results = await asyncio.gather(
+            *(session.close() for session in sessions),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error closing session: %s", result)
+
     def get_active_conversations(self) -> List[str]:
         """Get list of conversation IDs with active sessions."""
         return [cid for cid, s in self._sessions.items() if s.is_connected]
@@ -22,6 +22,7 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Set
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query, Body, WebSocket
 from pydantic import BaseModel, Field
 from starlette.websockets import WebSocketDisconnect
@@ -93,6 +94,9 @@ except ImportError:
 class ConversationStreamManager:
     """Keeps track of WebSocket subscribers for conversation event broadcasts."""
 
+    # Seconds a single subscriber may take to accept a frame before it is evicted
+    SEND_TIMEOUT = 0.5
+
     def __init__(self) -> None:
         self._lock = asyncio.Lock()
         self._subscribers: Dict[str, Set[WebSocket]] = defaultdict(set)
@@ -111,28 +115,62 @@ class ConversationStreamManager:
                 self._subscribers.pop(conversation_id, None)
 
     async def broadcast(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        await self.broadcast_raw(conversation_id, orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode())
+
+    async def broadcast_raw(self, conversation_id: str, frame: str) -> None:
+        """Send an already-encoded JSON text frame to all subscribers.
+
+        Sends run concurrently; a subscriber that errors or doesn't accept the
+        frame within SEND_TIMEOUT is dropped so it can't stall the others, and
+        its socket is closed (1013, try again later) so the client reconnects
+        instead of silently missing events on a possibly half-sent stream.
+        """
         async with self._lock:
             subscribers = list(self._subscribers.get(conversation_id, set()))
-        stale: List[WebSocket] = []
-        for websocket in subscribers:
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                stale.append(websocket)
-        if stale:
-            async with self._lock:
-                active = self._subscribers.get(conversation_id)
-                if not active:
-                    return
+        if not subscribers:
+            return
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.send_text(frame), self.SEND_TIMEOUT) for websocket in subscribers),
+            return_exceptions=True,
+        )
+        stale = [ws for ws, result in zip(subscribers, results) if isinstance(result, Exception)]
+        if not stale:
+            return
+        async with self._lock:
+            active = self._subscribers.get(conversation_id)
+            if active:
                 for socket in stale:
                     active.discard(socket)
                 if not active:
                     self._subscribers.pop(conversation_id, None)
+        logger.warning("Evicting %d slow or failed subscriber(s) from conversation %s", len(stale), conversation_id)
+        await asyncio.gather(*(self._close_evicted(ws) for ws in stale))
+
+    async def _close_evicted(self, websocket: WebSocket) -> None:
+        # Ends the stream endpoint's receive loop; the socket may already be broken
+        try:
+            await asyncio.wait_for(websocket.close(code=1013), self.SEND_TIMEOUT)
+        except Exception:
+            pass
 
 
 stream_manager = ConversationStreamManager()
 
 
+def encode_event_frame(record: Dict[str, Any]) -> str:
+    """Encode a stored event record as an ``{"type": "event"}`` stream frame.
+
+    Records coming from the conversation store are already JSON-safe, so they
+    are serialized directly instead of being round-tripped through
+    ``ConversationEvent``. The model is only used if orjson can't encode them.
+    """
+    try:
+        return orjson.dumps({"type": "event", "event": record}, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        event = ConversationEvent(**record).model_dump(mode="json")
+        return orjson.dumps({"type": "event", "event": event}).decode()
+
+
 # ---------------------------------------------------------------------------
 # Agent Injection Helper
 # ---------------------------------------------------------------------------
@@ -552,15 +590,8 @@ async def append_conversation_event(
         event_type=event.type,
         timestamp=timestamp,
     )
-    payload = ConversationEvent(**record)
-    await stream_manager.broadcast(
-        conversation_id,
-        {
-            "type": "event",
-            "event": payload.model_dump(mode="json"),
-        },
-    )
-    return payload
+    await stream_manager.broadcast_raw(conversation_id, encode_event_frame(record))
+    return ConversationEvent(**record)
 
 
 # ---------------------------------------------------------------------------
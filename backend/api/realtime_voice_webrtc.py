@@ -14,16 +14,28 @@ Architecture (N:1 per conversation):
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
-from typing import Dict
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from .realtime_session_manager import get_session_manager, OpenAISession
+from .realtime_session_manager import (
+    get_session_manager,
+    OpenAISession,
+    format_agent_event,
+    normalize_event_type,
+    get_http_session,
+    close_http_session,
+    AGENT_WS_OPTIONS,
+)
 from .browser_connection_manager import (
     get_or_create_manager,
     get_manager,
@@ -38,18 +50,18 @@ except ImportError:
     from config.schemas import AudioMessageRequest, AudioMessageResponse, TextMessageRequest
 
 try:
-    from .realtime_voice import prepare_voice_system_prompt, VOICE_SYSTEM_PROMPT, stream_manager, ConversationEvent
+    from .realtime_voice import prepare_voice_system_prompt, VOICE_SYSTEM_PROMPT, stream_manager, encode_event_frame
 except Exception:
     VOICE_SYSTEM_PROMPT = "You are a realtime voice assistant."
     def prepare_voice_system_prompt(base_prompt, agent_name, conversation_id=None, memory_file_path=None):
         return base_prompt
     stream_manager = None
-    ConversationEvent = None
+    encode_event_frame = None
 
 try:
-    from ..utils.voice_conversation_store import store as conversation_store
+    from ..utils.voice_conversation_store import store as conversation_store, run_store_call
 except ImportError:
-    from utils.voice_conversation_store import store as conversation_store
+    from utils.voice_conversation_store import store as conversation_store, run_store_call
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -62,6 +74,38 @@ VOICE_CONFIGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "vo
 VOICE_PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "voice", "prompts")
 VOICE_SELECTED_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "voice", "selected_config.json")
 
+def _mtime_ns(path: str) -> Optional[int]:
+    """Return a file's modification time in ns, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# Config and prompt files are re-read on every voice turn. Parsed contents are
+# cached keyed by (path, mtime), so edits are picked up on the next call.
+@functools.lru_cache(maxsize=8)
+def _read_prompt_cached(path: str, mtime_ns: int) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    logger.info(f"[VoiceConfig] Loaded prompt from '{os.path.basename(path)}' ({len(content)} chars)")
+    return content
+
+
+@functools.lru_cache(maxsize=8)
+def _read_json_cached(path: str, mtime_ns: int) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    """Read a JSON file through the mtime cache. Returns None if missing."""
+    mtime_ns = _mtime_ns(path)
+    if mtime_ns is None:
+        return None
+    return dict(_read_json_cached(path, mtime_ns))
+
+
 def _load_voice_prompt_file(filename: str) -> str:
     """Load a voice prompt from the prompts directory.
 
@@ -69,11 +113,9 @@ def _load_voice_prompt_file(filename: str) -> str:
     """
     try:
         prompt_path = os.path.join(VOICE_PROMPTS_DIR, filename)
-        if os.path.exists(prompt_path):
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                logger.info(f"[VoiceConfig] Loaded prompt from '{filename}' ({len(content)} chars)")
-                return content
+        mtime_ns = _mtime_ns(prompt_path)
+        if mtime_ns is not None:
+            return _read_prompt_cached(prompt_path, mtime_ns)
         else:
             logger.warning(f"[VoiceConfig] Prompt file '{filename}' not found, using VOICE_SYSTEM_PROMPT fallback")
     except Exception as e:
@@ -89,26 +131,21 @@ def _load_selected_voice_config() -> dict:
     try:
         # First, get the selected config name
         selected_name = "default"
-        if os.path.exists(VOICE_SELECTED_CONFIG_PATH):
-            with open(VOICE_SELECTED_CONFIG_PATH) as f:
-                data = json.load(f)
-                selected_name = data.get("selected", "default")
+        data = _read_json(VOICE_SELECTED_CONFIG_PATH)
+        if data is not None:
+            selected_name = data.get("selected", "default")
 
         # Load the config file
-        config_path = os.path.join(VOICE_CONFIGS_DIR, f"{selected_name}.json")
-        if os.path.exists(config_path):
-            with open(config_path) as f:
-                config = json.load(f)
-                logger.info(f"[VoiceConfig] Loaded config '{selected_name}': voice={config.get('voice')}, agent={config.get('agent_name')}")
-                return config
+        config = _read_json(os.path.join(VOICE_CONFIGS_DIR, f"{selected_name}.json"))
+        if config is not None:
+            logger.info(f"[VoiceConfig] Loaded config '{selected_name}': voice={config.get('voice')}, agent={config.get('agent_name')}")
+            return config
 
         # Fall back to default if selected doesn't exist
-        default_path = os.path.join(VOICE_CONFIGS_DIR, "default.json")
-        if os.path.exists(default_path):
-            with open(default_path) as f:
-                config = json.load(f)
-                logger.warning(f"[VoiceConfig] Selected config '{selected_name}' not found, using default")
-                return config
+        config = _read_json(os.path.join(VOICE_CONFIGS_DIR, "default.json"))
+        if config is not None:
+            logger.warning(f"[VoiceConfig] Selected config '{selected_name}' not found, using default")
+            return config
 
     except Exception as e:
         logger.error(f"[VoiceConfig] Error loading config: {e}")
@@ -157,15 +194,47 @@ class TextRequest(BaseModel):
 # Active Session Tracking
 # ============================================================================
 
-# Maps conversation_id to (OpenAISession, BrowserConnectionManager) pair
-# This keeps them linked together
-_active_conversations: Dict[str, tuple] = {}
-_lock = asyncio.Lock()
+@dataclass(slots=True)
+class _ConversationEntry:
+    """Links a conversation's OpenAI session with its browser manager."""
+    openai_session: OpenAISession
+    browser_mgr: BrowserConnectionManager
 
 
-async def _get_or_setup_conversation(
-    conversation_id: str,
-) -> tuple[OpenAISession, BrowserConnectionManager]:
+class ConversationNotFoundError(LookupError):
+    """Raised by setup helpers when a conversation isn't in the store."""
+
+
+# Maps conversation_id to its linked OpenAI session and browser manager
+_active_conversations: Dict[str, _ConversationEntry] = {}
+
+# In-flight conversation setups, so concurrent connects for the same new
+# conversation share one setup instead of each creating an OpenAI session
+_setup_futures: Dict[str, asyncio.Future] = {}
+
+# Per-conversation state is guarded by a sharded lock so that independent
+# conversations don't serialize on a single process-wide lock.
+_LOCK_SHARD_COUNT = 16
+_LOCK_SHARDS = [asyncio.Lock() for _ in range(_LOCK_SHARD_COUNT)]
+
+
+def _lock_for(conversation_id: str) -> asyncio.Lock:
+    """Return the lock shard guarding a conversation's entry."""
+    return _LOCK_SHARDS[hash(conversation_id) & (_LOCK_SHARD_COUNT - 1)]
+
+
+# Conversation IDs are UUIDs minted by the conversation store; anything outside
+# this charset/length can't exist, so reject it before touching the store.
+_VALID_CONV_ID = re.compile(r"[A-Za-z0-9_-]{8,64}")
+
+
+def _require_valid_conversation_id(conversation_id: str) -> None:
+    """Raise 404 for conversation IDs that can't belong to the store."""
+    if not _VALID_CONV_ID.fullmatch(conversation_id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+
+async def _get_or_setup_conversation(conversation_id: str) -> _ConversationEntry:
     """
     Get or set up a conversation with both OpenAI session and browser manager.
 
@@ -175,18 +244,61 @@ async def _get_or_setup_conversation(
     Browser audio → OpenAI session
     OpenAI audio → broadcast to all browsers
     """
-    async with _lock:
-        if conversation_id in _active_conversations:
-            openai_session, browser_mgr = _active_conversations[conversation_id]
-            if openai_session.is_connected:
-                return openai_session, browser_mgr
-            # Session died, clean up
-            del _active_conversations[conversation_id]
+    _require_valid_conversation_id(conversation_id)
+
+    while True:
+        async with _lock_for(conversation_id):
+            entry = _active_conversations.get(conversation_id)
+            if entry is not None:
+                if entry.openai_session.is_connected:
+                    return entry
+                # Session died, clean up
+                del _active_conversations[conversation_id]
+
+            # Single-flight: if another caller is already setting this
+            # conversation up, wait for its result instead of racing it. A
+            # cancelled setup may still be registered; take it over.
+            pending = _setup_futures.get(conversation_id)
+            if pending is None or pending.cancelled():
+                future = asyncio.get_running_loop().create_future()
+                _setup_futures[conversation_id] = future
+                break
 
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The leader's request was cancelled (e.g. its client went away);
+            # that isn't this caller's failure, so retry and lead the setup.
+            if pending.cancelled() and not asyncio.current_task().cancelling():
+                continue
+            raise
+
+    try:
+        result = await _setup_conversation(conversation_id)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark the exception as retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        async with _lock_for(conversation_id):
+            if _setup_futures.get(conversation_id) is future:
+                del _setup_futures[conversation_id]
+
+    return result
+
+
+async def _setup_conversation(conversation_id: str) -> _ConversationEntry:
+    """Create the OpenAI session and browser manager for a conversation."""
     # Verify conversation exists
-    conversation = conversation_store.get_conversation(conversation_id)
+    conversation = await run_store_call(conversation_store.get_conversation, conversation_id)
     if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
+        raise ConversationNotFoundError(conversation_id)
 
     # Load voice configuration from backend's selected config file
     voice_config = _load_selected_voice_config()
@@ -197,7 +309,10 @@ async def _get_or_setup_conversation(
     voice_model = voice_config.get("voice_model", "gpt-realtime")
     system_prompt_file = voice_config.get("system_prompt_file", "default.txt")
 
-    logger.info(f"[Setup] Creating session for {conversation_id} with config: voice={voice}, agent={agent_name}, prompt_file={system_prompt_file}")
+    logger.info(
+        "[Setup] Creating session for %s with config: voice=%s, agent=%s, prompt_file=%s",
+        conversation_id, voice, agent_name, system_prompt_file,
+    )
 
     # Load the base prompt from file and prepare it with injections
     base_prompt = _load_voice_prompt_file(system_prompt_file)
@@ -226,23 +341,30 @@ async def _get_or_setup_conversation(
     # Set up browser audio callback → OpenAI
     browser_mgr.on_browser_audio = openai_session.send_audio  # Browser audio → OpenAI
 
-    async with _lock:
-        _active_conversations[conversation_id] = (openai_session, browser_mgr)
+    entry = _ConversationEntry(openai_session=openai_session, browser_mgr=browser_mgr)
+    async with _lock_for(conversation_id):
+        _active_conversations[conversation_id] = entry
 
-    return openai_session, browser_mgr
+    return entry
 
 
 async def _cleanup_conversation(conversation_id: str) -> None:
     """Clean up a conversation's sessions and managers."""
-    async with _lock:
+    async with _lock_for(conversation_id):
         _active_conversations.pop(conversation_id, None)
+    _cancel_agent_listeners(conversation_id)
 
-    # Close OpenAI session
+    # Close the OpenAI session and browser connections concurrently. Both are
+    # network teardowns; let each finish before surfacing a failure.
     session_mgr = get_session_manager()
-    await session_mgr.close_session(conversation_id)
-
-    # Close browser connections
-    await remove_manager(conversation_id)
+    results = await asyncio.gather(
+        session_mgr.close_session(conversation_id),
+        remove_manager(conversation_id),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 
 # ============================================================================
@@ -261,26 +383,30 @@ async def signal_connect(request: SignalRequest):
 
     Multiple browsers can connect to the same conversation.
     """
-    logger.info(f"[Signal] Browser connecting to conversation {request.conversation_id}")
+    logger.info("[Signal] Browser connecting to conversation %s", request.conversation_id)
 
     try:
         # Get or create the conversation setup (config loaded from backend)
-        openai_session, browser_mgr = await _get_or_setup_conversation(
+        entry = await _get_or_setup_conversation(
             conversation_id=request.conversation_id,
         )
+        browser_mgr = entry.browser_mgr
 
         # Add browser connection
         connection_id, answer_sdp = await browser_mgr.add_connection(request.offer)
 
-        logger.info(f"[Signal] ✅ Browser {connection_id[:8]} connected to {request.conversation_id}")
-        logger.info(f"[Signal]    Total browsers: {browser_mgr.connection_count}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Signal] ✅ Browser %.8s connected to %s", connection_id, request.conversation_id)
+            logger.info("[Signal]    Total browsers: %d", browser_mgr.connection_count)
 
         return SignalResponse(connection_id=connection_id, answer=answer_sdp)
 
     except HTTPException:
         raise
+    except ConversationNotFoundError:
+        raise HTTPException(status_code=404, detail="Conversation not found")
     except Exception as exc:
-        logger.error(f"[Signal] Failed to connect browser: {exc}")
+        logger.error("[Signal] Failed to connect browser: %s", exc)
         raise HTTPException(status_code=500, detail=f"Connection failed: {exc}")
 
 
@@ -295,24 +421,26 @@ async def signal_disconnect(request: DisconnectRequest):
     Use DELETE /conversation/{id} (Force Stop) to close everything.
     """
     connection_id = request.connection_id
-    logger.info(f"[Signal] Browser {connection_id[:8]} disconnecting")
+    logger.info("[Signal] Browser %.8s disconnecting", connection_id)
 
     connection_found = False
     conv_id_found = None
 
-    # Find which conversation this connection belongs to
-    async with _lock:
-        for conv_id, (openai_session, browser_mgr) in _active_conversations.items():
-            if connection_id in browser_mgr.connection_ids:
+    # Find which conversation this connection belongs to. The scan itself
+    # doesn't await, so only the owning conversation's shard is locked.
+    for conv_id, entry in list(_active_conversations.items()):
+        browser_mgr = entry.browser_mgr
+        if browser_mgr.get_connection(connection_id) is not None:
+            async with _lock_for(conv_id):
                 removed = await browser_mgr.remove_connection(connection_id)
-                if removed:
-                    connection_found = True
-                    conv_id_found = conv_id
-                    remaining = browser_mgr.connection_count
-                    logger.info(f"[Signal] ✅ Browser {connection_id[:8]} disconnected from {conv_id}")
-                    logger.info(f"[Signal]    Remaining browsers: {remaining}")
-                    # OpenAI session stays alive - only Force Stop closes it
-                break
+            if removed:
+                connection_found = True
+                conv_id_found = conv_id
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("[Signal] ✅ Browser %.8s disconnected from %s", connection_id, conv_id)
+                    logger.info("[Signal]    Remaining browsers: %d", browser_mgr.connection_count)
+                # OpenAI session stays alive - only Force Stop closes it
+            break
 
     if connection_found:
         return JSONResponse({
@@ -336,16 +464,16 @@ async def stop_conversation(conversation_id: str):
 
     Returns success even if the conversation was not active (idempotent).
     """
-    logger.info(f"[Signal] Stopping conversation {conversation_id}")
+    logger.info("[Signal] Stopping conversation %s", conversation_id)
 
-    async with _lock:
+    async with _lock_for(conversation_id):
         was_active = conversation_id in _active_conversations
 
     if was_active:
         await _cleanup_conversation(conversation_id)
-        logger.info(f"[Signal] ✅ Conversation {conversation_id} stopped")
+        logger.info("[Signal] ✅ Conversation %s stopped", conversation_id)
     else:
-        logger.info(f"[Signal] Conversation {conversation_id} was not active (already stopped or never started)")
+        logger.info("[Signal] Conversation %s was not active (already stopped or never started)", conversation_id)
 
     return JSONResponse({"status": "stopped", "conversation_id": conversation_id, "was_active": was_active})
 
@@ -353,30 +481,34 @@ async def stop_conversation(conversation_id: str):
 @router.get("/api/realtime/webrtc/conversation/{conversation_id}/status")
 async def get_conversation_status(conversation_id: str):
     """Get status of an active conversation."""
-    async with _lock:
-        if conversation_id not in _active_conversations:
+    async with _lock_for(conversation_id):
+        entry = _active_conversations.get(conversation_id)
+        if entry is None:
             return JSONResponse({
                 "conversation_id": conversation_id,
                 "active": False,
             })
 
-        openai_session, browser_mgr = _active_conversations[conversation_id]
+        browser_mgr = entry.browser_mgr
         return JSONResponse({
             "conversation_id": conversation_id,
             "active": True,
-            "openai_connected": openai_session.is_connected,
+            "openai_connected": entry.openai_session.is_connected,
             "browser_count": browser_mgr.connection_count,
-            "browser_connections": list(browser_mgr.connection_ids),
+            "browser_connections": browser_mgr.connection_ids_snapshot,
         })
 
 
 @router.post("/api/realtime/webrtc/conversation/{conversation_id}/text")
 async def send_text(conversation_id: str, request: TextRequest):
     """Send a text message to the OpenAI session."""
-    async with _lock:
-        if conversation_id not in _active_conversations:
-            raise HTTPException(status_code=404, detail="Conversation not active")
-        openai_session, _ = _active_conversations[conversation_id]
+    _require_valid_conversation_id(conversation_id)
+
+    async with _lock_for(conversation_id):
+        entry = _active_conversations.get(conversation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Conversation not active")
+    openai_session = entry.openai_session
 
     try:
         await openai_session.send_text(request.text)
@@ -392,10 +524,13 @@ async def commit_audio(conversation_id: str):
     Manually commit audio buffer (for manual VAD mode).
     Signals that the user is done speaking.
     """
-    async with _lock:
-        if conversation_id not in _active_conversations:
-            raise HTTPException(status_code=404, detail="Conversation not active")
-        openai_session, _ = _active_conversations[conversation_id]
+    _require_valid_conversation_id(conversation_id)
+
+    async with _lock_for(conversation_id):
+        entry = _active_conversations.get(conversation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Conversation not active")
+    openai_session = entry.openai_session
 
     try:
         await openai_session.commit_audio_buffer()
@@ -408,10 +543,13 @@ async def commit_audio(conversation_id: str):
 @router.post("/api/realtime/webrtc/conversation/{conversation_id}/send-to-nested")
 async def send_to_nested(conversation_id: str, request: TextRequest):
     """Manually send a message to nested agents."""
-    async with _lock:
-        if conversation_id not in _active_conversations:
-            raise HTTPException(status_code=404, detail="Conversation not active")
-        openai_session, _ = _active_conversations[conversation_id]
+    _require_valid_conversation_id(conversation_id)
+
+    async with _lock_for(conversation_id):
+        entry = _active_conversations.get(conversation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Conversation not active")
+    openai_session = entry.openai_session
 
     result = await openai_session._tool_send_to_nested(request.text)
     if not result.get("success"):
@@ -422,10 +560,13 @@ async def send_to_nested(conversation_id: str, request: TextRequest):
 @router.post("/api/realtime/webrtc/conversation/{conversation_id}/send-to-claude-code")
 async def send_to_claude_code(conversation_id: str, request: TextRequest):
     """Manually send a message to Claude Code."""
-    async with _lock:
-        if conversation_id not in _active_conversations:
-            raise HTTPException(status_code=404, detail="Conversation not active")
-        openai_session, _ = _active_conversations[conversation_id]
+    _require_valid_conversation_id(conversation_id)
+
+    async with _lock_for(conversation_id):
+        entry = _active_conversations.get(conversation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Conversation not active")
+    openai_session = entry.openai_session
 
     result = await openai_session._tool_send_to_claude_code(request.text)
     if not result.get("success"):
@@ -516,6 +657,12 @@ async def get_bridge_status_legacy(conversation_id: str):
 # Disconnected Voice Mode (non-WebRTC audio chat)
 # ============================================================================
 
+@router.on_event("shutdown")
+async def _close_http_session() -> None:
+    """Close the shared aiohttp session on application shutdown."""
+    await close_http_session()
+
+
 async def _store_and_broadcast_event(
     conversation_id: str,
     payload: dict,
@@ -526,7 +673,8 @@ async def _store_and_broadcast_event(
     Store an event and broadcast it to all connected WebSocket subscribers.
     This ensures disconnected mode events appear in the frontend conversation history.
     """
-    record = conversation_store.append_event(
+    record = await run_store_call(
+        conversation_store.append_event,
         conversation_id=conversation_id,
         payload=payload,
         source=source,
@@ -534,22 +682,85 @@ async def _store_and_broadcast_event(
     )
 
     # Broadcast to connected subscribers if stream_manager is available
-    if stream_manager and ConversationEvent:
+    if stream_manager and encode_event_frame:
         try:
-            event_obj = ConversationEvent(**record)
-            await stream_manager.broadcast(
-                conversation_id,
-                {
-                    "type": "event",
-                    "event": event_obj.model_dump(mode="json"),
-                },
-            )
+            await stream_manager.broadcast_raw(conversation_id, encode_event_frame(record))
         except Exception as e:
-            logger.warning(f"[DisconnectedMode] Failed to broadcast event: {e}")
+            logger.warning("[DisconnectedMode] Failed to broadcast event: %s", e)
 
     return record
 
 
+async def _store_and_broadcast_events(
+    conversation_id: str,
+    events: list,
+) -> list:
+    """
+    Store several (payload, source, event_type) events in one transaction and
+    broadcast each stored record.
+    """
+    records = await run_store_call(conversation_store.append_events, conversation_id, events)
+
+    if stream_manager and encode_event_frame:
+        for record in records:
+            try:
+                await stream_manager.broadcast_raw(conversation_id, encode_event_frame(record))
+            except Exception as e:
+                logger.warning("[DisconnectedMode] Failed to broadcast event: %s", e)
+
+    return records
+
+
+# Background persistence for fire-and-forget events (e.g. tool call
+# bookkeeping) whose records aren't needed by the caller. A single worker
+# keeps them in FIFO order; each queue item is one batch of events.
+_persist_queue: asyncio.Queue = asyncio.Queue()
+_persist_worker_task = None
+
+
+async def _persist_worker() -> None:
+    """Drain the persistence queue, storing and broadcasting each batch."""
+    while True:
+        conversation_id, events = await _persist_queue.get()
+        try:
+            await _store_and_broadcast_events(conversation_id, events)
+        except Exception as exc:
+            logger.error("[DisconnectedMode] Failed to persist %d events: %s", len(events), exc)
+        finally:
+            _persist_queue.task_done()
+
+
+def _enqueue_store_and_broadcast_events(conversation_id: str, events: list) -> None:
+    """Queue (payload, source, event_type) events to be stored and broadcast without awaiting the write."""
+    global _persist_worker_task
+    if not events:
+        return
+    if _persist_worker_task is None or _persist_worker_task.done():
+        _persist_worker_task = asyncio.create_task(_persist_worker())
+    _persist_queue.put_nowait((conversation_id, events))
+
+
+@router.on_event("shutdown")
+async def _drain_persist_queue() -> None:
+    """Flush queued events and stop the persistence worker on shutdown."""
+    global _persist_worker_task
+    if _persist_worker_task is None:
+        return
+    try:
+        await asyncio.wait_for(_persist_queue.join(), timeout=5.0)
+    except asyncio.TimeoutError:
+        logger.warning("[DisconnectedMode] %d queued events not persisted at shutdown", _persist_queue.qsize())
+    _persist_worker_task.cancel()
+    _persist_worker_task = None
+
+
+# Summary prefix and default agent name per event source
+_AGENT_SOURCE_DEFAULTS = {
+    "nested_agent": ("[TEAM", "Agent"),
+    "claude_code": ("[CODE", "ClaudeCode"),
+}
+
+
 async def _handle_agent_event(
     conversation_id: str,
     event: dict,
@@ -559,43 +770,19 @@ async def _handle_agent_event(
     Handle and broadcast an event from an agent WebSocket.
     Mirrors the logic from realtime_session_manager._handle_nested_message.
     """
-    event_type = event.get("type", "").lower()
-    event_data = event.get("data", {})
+    event_type = normalize_event_type(event.get("type") or "")
+    event_data = event.get("data") or {}
 
     # Extract agent/source info
-    agent = event_data.get("source") or event_data.get("agent") or (
-        "Agent" if source_type == "nested_agent" else "ClaudeCode"
-    )
+    prefix, default_agent = _AGENT_SOURCE_DEFAULTS.get(source_type, _AGENT_SOURCE_DEFAULTS["claude_code"])
+    agent = event_data.get("source") or event_data.get("agent") or default_agent
 
-    # Build a message summary (for logging)
-    message = None
-    prefix = "[TEAM" if source_type == "nested_agent" else "[CODE"
-
-    if event_type == "textmessage":
-        content = event_data.get("content", "")
-        message = f"{prefix} {agent}] {content}"
-    elif event_type == "toolcallrequestevent":
-        tool_name = event_data.get("name", "Tool")
-        message = f"{prefix} {agent}] Requesting tool: {tool_name}"
-    elif event_type == "toolcallexecutionevent":
-        tool_name = event_data.get("name") or "Tool"
-        content_items = event_data.get("content", [])
-        if isinstance(content_items, list) and content_items:
-            tool_name = content_items[0].get("name", tool_name)
-        result_text = str(event_data.get("result", ""))[:200]
-        message = f"{prefix} {tool_name}] {result_text}" if result_text else f"{prefix} {tool_name}] completed"
-    elif event_type == "taskresult":
-        outcome = event_data.get("outcome", "completed")
-        summary = event_data.get("message", "")
-        message = f"{prefix}] Task {outcome}: {summary}"
-    elif event_type == "system":
-        sys_message = event_data.get("message", "")
-        message = f"{prefix} System] {sys_message}"
-    else:
-        message = f"{prefix} {agent}] {event_type}"
+    # Build a message summary
+    message = format_agent_event(prefix, agent, event_type, event_data)
 
-    if message:
-        logger.info(f"[DisconnectedAgent] {message[:100]}...")
+    # The summary is also part of the broadcast payload, so only the log call
+    # itself is lazy; %.100s truncates inside the formatter.
+    logger.info("[DisconnectedAgent] %.100s...", message)
 
     # Broadcast the event to the frontend
     await _store_and_broadcast_event(
@@ -613,6 +800,47 @@ async def _handle_agent_event(
     )
 
 
+# Background agent listeners per conversation, so they can be cancelled when
+# the conversation ends instead of running until their timeout
+_listener_tasks: Dict[str, Set[asyncio.Task]] = {}
+
+
+def _start_agent_listener(conversation_id: str, ws, source: str) -> asyncio.Task:
+    """Listen to an agent WebSocket in a tracked background task, closing it when done."""
+    async def listen_and_close():
+        try:
+            await _listen_agent_websocket(conversation_id, ws, source, timeout=120.0)
+        finally:
+            await ws.close()
+
+    task = asyncio.create_task(listen_and_close(), name=f"listener-{source}-{conversation_id}")
+    tasks = _listener_tasks.setdefault(conversation_id, set())
+    tasks.add(task)
+
+    def _discard(done: asyncio.Task) -> None:
+        tasks.discard(done)
+        if not tasks and _listener_tasks.get(conversation_id) is tasks:
+            del _listener_tasks[conversation_id]
+
+    task.add_done_callback(_discard)
+    return task
+
+
+def _cancel_agent_listeners(conversation_id: str) -> None:
+    """Cancel any background agent listeners for a conversation."""
+    for task in list(_listener_tasks.get(conversation_id, ())):
+        task.cancel()
+
+
+@router.on_event("shutdown")
+async def _cancel_all_agent_listeners() -> None:
+    """Cancel every background agent listener on application shutdown."""
+    tasks = [task for group in _listener_tasks.values() for task in group]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def _listen_agent_websocket(
     conversation_id: str,
     ws,
@@ -625,36 +853,43 @@ async def _listen_agent_websocket(
     """
     import aiohttp
 
+    async def consume() -> None:
+        while True:
+            msg = await ws.receive()
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                try:
+                    event = orjson.loads(msg.data)
+                    await _handle_agent_event(conversation_id, event, source_type)
+
+                    # Check if this is a task completion event
+                    event_type = event.get("type", "").lower()
+                    if event_type in ("taskresult", "error", "complete"):
+                        logger.info("[DisconnectedAgent] Task completed: %s", event_type)
+                        return
+                except orjson.JSONDecodeError:
+                    logger.warning("[DisconnectedAgent] Invalid JSON: %.100s", msg.data)
+            elif msg.type == aiohttp.WSMsgType.CLOSED:
+                logger.info("[DisconnectedAgent] WebSocket closed")
+                return
+            elif msg.type == aiohttp.WSMsgType.ERROR:
+                logger.error("[DisconnectedAgent] WebSocket error")
+                return
+
     try:
-        end_time = asyncio.get_event_loop().time() + timeout
-        while asyncio.get_event_loop().time() < end_time:
-            try:
-                msg = await asyncio.wait_for(ws.receive(), timeout=5.0)
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    try:
-                        event = json.loads(msg.data)
-                        await _handle_agent_event(conversation_id, event, source_type)
-
-                        # Check if this is a task completion event
-                        event_type = event.get("type", "").lower()
-                        if event_type in ("taskresult", "error", "complete"):
-                            logger.info(f"[DisconnectedAgent] Task completed: {event_type}")
-                            break
-                    except json.JSONDecodeError:
-                        logger.warning(f"[DisconnectedAgent] Invalid JSON: {msg.data[:100]}")
-                elif msg.type == aiohttp.WSMsgType.CLOSED:
-                    logger.info(f"[DisconnectedAgent] WebSocket closed")
-                    break
-                elif msg.type == aiohttp.WSMsgType.ERROR:
-                    logger.error(f"[DisconnectedAgent] WebSocket error")
-                    break
-            except asyncio.TimeoutError:
-                # No message received, continue listening
-                continue
+        # One deadline for the whole listener instead of waking up every few
+        # seconds to poll the clock
+        await asyncio.wait_for(consume(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.info("[DisconnectedAgent] Listener timed out after %.0fs", timeout)
     except asyncio.CancelledError:
-        logger.info(f"[DisconnectedAgent] Listener cancelled")
+        logger.info("[DisconnectedAgent] Listener cancelled")
     except Exception as exc:
-        logger.error(f"[DisconnectedAgent] Error listening: {exc}")
+        logger.error("[DisconnectedAgent] Error listening: %s", exc)
+
+
+def _encode_user_message(text: str) -> str:
+    """Encode a user_message frame for an agent WebSocket (sent as text)."""
+    return orjson.dumps({"type": "user_message", "data": text}).decode()
 
 
 async def _execute_disconnected_tool_calls(
@@ -672,20 +907,24 @@ async def _execute_disconnected_tool_calls(
 
     Returns list of tool results.
     """
-    import aiohttp
-
     results = []
+    tool_events = []
 
     for tc in tool_calls:
         tool_name = tc.get("name", "")
         arguments = tc.get("arguments", "{}")
 
-        try:
-            args = json.loads(arguments) if isinstance(arguments, str) else arguments
-        except json.JSONDecodeError:
+        if not isinstance(arguments, str):
+            args = arguments
+        elif not arguments or arguments == "{}":
             args = {}
+        else:
+            try:
+                args = orjson.loads(arguments)
+            except orjson.JSONDecodeError:
+                args = {}
 
-        logger.info(f"[DisconnectedTool] Executing {tool_name} with args: {args}")
+        logger.info("[DisconnectedTool] Executing %s with args: %s", tool_name, args)
 
         result = {"tool": tool_name, "success": False, "error": None}
 
@@ -698,15 +937,12 @@ async def _execute_disconnected_tool_calls(
 
                 if session and session.nested_ws and not session.nested_ws.closed:
                     try:
-                        await session.nested_ws.send_json({
-                            "type": "user_message",
-                            "data": text
-                        })
+                        await session.nested_ws.send_str(_encode_user_message(text))
                         result["success"] = True
-                        logger.info(f"[DisconnectedTool] Sent to nested via existing session: {text[:100]}...")
+                        logger.info("[DisconnectedTool] Sent to nested via existing session: %.100s...", text)
                     except Exception as e:
                         result["error"] = f"Failed to send to nested: {e}"
-                        logger.error(f"[DisconnectedTool] {result['error']}")
+                        logger.error("[DisconnectedTool] %s", result["error"])
                 else:
                     # Connect and start background listener
                     try:
@@ -714,30 +950,20 @@ async def _execute_disconnected_tool_calls(
                         agent_name = voice_config.get("agent_name", "MainConversation")
                         ws_url = f"ws://localhost:8000/api/runs/{agent_name}"
 
-                        # Create a persistent session for the background task
-                        http_session = aiohttp.ClientSession()
-                        ws = await http_session.ws_connect(ws_url)
+                        http_session = await get_http_session()
+                        ws = await http_session.ws_connect(ws_url, **AGENT_WS_OPTIONS)
 
                         # Send the user message
-                        await ws.send_json({"type": "user_message", "data": text})
-                        logger.info(f"[DisconnectedTool] Sent to nested agent {agent_name}: {text[:100]}...")
-
-                        # Start background task to listen for events
-                        async def listen_and_cleanup():
-                            try:
-                                await _listen_agent_websocket(
-                                    conversation_id, ws, "nested_agent", timeout=120.0
-                                )
-                            finally:
-                                await ws.close()
-                                await http_session.close()
-
-                        asyncio.create_task(listen_and_cleanup())
+                        await ws.send_str(_encode_user_message(text))
+                        logger.info("[DisconnectedTool] Sent to nested agent %s: %.100s...", agent_name, text)
+
+                        # Listen for events in the background
+                        _start_agent_listener(conversation_id, ws, "nested_agent")
                         result["success"] = True
 
                     except Exception as e:
                         result["error"] = f"Failed to connect to nested agent: {e}"
-                        logger.error(f"[DisconnectedTool] {result['error']}")
+                        logger.error("[DisconnectedTool] %s", result["error"])
             else:
                 result["error"] = "No text provided"
 
@@ -750,62 +976,46 @@ async def _execute_disconnected_tool_calls(
 
                 if session and session.claude_code_ws and not session.claude_code_ws.closed:
                     try:
-                        await session.claude_code_ws.send_json({
-                            "type": "user_message",
-                            "data": text
-                        })
+                        await session.claude_code_ws.send_str(_encode_user_message(text))
                         result["success"] = True
-                        logger.info(f"[DisconnectedTool] Sent to Claude Code via existing session: {text[:100]}...")
+                        logger.info("[DisconnectedTool] Sent to Claude Code via existing session: %.100s...", text)
                     except Exception as e:
                         result["error"] = f"Failed to send to Claude Code: {e}"
-                        logger.error(f"[DisconnectedTool] {result['error']}")
+                        logger.error("[DisconnectedTool] %s", result["error"])
                 else:
                     # Connect and start background listener
                     try:
                         ws_url = "ws://localhost:8000/api/runs/ClaudeCode"
 
-                        # Create a persistent session for the background task
-                        http_session = aiohttp.ClientSession()
-                        ws = await http_session.ws_connect(ws_url)
+                        http_session = await get_http_session()
+                        ws = await http_session.ws_connect(ws_url, **AGENT_WS_OPTIONS)
 
                         # Send the user message
-                        await ws.send_json({"type": "user_message", "data": text})
-                        logger.info(f"[DisconnectedTool] Sent to Claude Code: {text[:100]}...")
-
-                        # Start background task to listen for events
-                        async def listen_and_cleanup():
-                            try:
-                                await _listen_agent_websocket(
-                                    conversation_id, ws, "claude_code", timeout=120.0
-                                )
-                            finally:
-                                await ws.close()
-                                await http_session.close()
-
-                        asyncio.create_task(listen_and_cleanup())
+                        await ws.send_str(_encode_user_message(text))
+                        logger.info("[DisconnectedTool] Sent to Claude Code: %.100s...", text)
+
+                        # Listen for events in the background
+                        _start_agent_listener(conversation_id, ws, "claude_code")
                         result["success"] = True
 
                     except Exception as e:
                         result["error"] = f"Failed to connect to Claude Code: {e}"
-                        logger.error(f"[DisconnectedTool] {result['error']}")
+                        logger.error("[DisconnectedTool] %s", result["error"])
             else:
                 result["error"] = "No text provided"
         else:
             result["error"] = f"Unknown tool: {tool_name}"
 
         results.append(result)
+        tool_events.append((
+            {"tool": tool_name, "arguments": args, "result": result},
+            "assistant",
+            "disconnected_tool_call",
+        ))
 
-        # Store and broadcast tool call event
-        await _store_and_broadcast_event(
-            conversation_id=conversation_id,
-            payload={
-                "tool": tool_name,
-                "arguments": args,
-                "result": result,
-            },
-            source="assistant",
-            event_type="disconnected_tool_call"
-        )
+    # Store and broadcast all tool call events as one batch in the
+    # background; nothing downstream needs their records
+    _enqueue_store_and_broadcast_events(conversation_id, tool_events)
 
     return results
 
@@ -825,10 +1035,11 @@ async def send_audio_message(conversation_id: str, request: AudioMessageRequest)
 
     Use this when the WebRTC realtime session is not active.
     """
-    logger.info(f"[AudioMessage] Received audio message for conversation {conversation_id}")
+    logger.info("[AudioMessage] Received audio message for conversation %s", conversation_id)
 
     # Verify conversation exists
-    conversation = conversation_store.get_conversation(conversation_id)
+    _require_valid_conversation_id(conversation_id)
+    conversation = await run_store_call(conversation_store.get_conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -848,8 +1059,8 @@ async def send_audio_message(conversation_id: str, request: AudioMessageRequest)
         memory_file_path=memory_file_path,
     )
 
-    # Get conversation history
-    events = conversation_store.list_events(conversation_id, limit=100)
+    # Get conversation history (most recent events, served from memory)
+    events = await run_store_call(conversation_store.recent_events, conversation_id, limit=100)
 
     # Create audio chat handler
     handler = AudioChatHandler(
@@ -866,7 +1077,10 @@ async def send_audio_message(conversation_id: str, request: AudioMessageRequest)
             audio_format=request.format
         )
 
-        logger.info(f"[AudioMessage] Got response: {len(text_response)} chars text, audio={'yes' if audio_response else 'no'}, tools={len(tool_calls) if tool_calls else 0}")
+        logger.info(
+            "[AudioMessage] Got response: %d chars text, audio=%s, tools=%d",
+            len(text_response), "yes" if audio_response else "no", len(tool_calls) if tool_calls else 0,
+        )
 
         # Store and broadcast user audio event
         await _store_and_broadcast_event(
@@ -901,7 +1115,7 @@ async def send_audio_message(conversation_id: str, request: AudioMessageRequest)
         )
 
     except Exception as exc:
-        logger.error(f"[AudioMessage] Failed to process audio: {exc}")
+        logger.error("[AudioMessage] Failed to process audio: %s", exc)
         raise HTTPException(status_code=500, detail=f"Failed to process audio: {exc}")
 
 
@@ -920,10 +1134,11 @@ async def send_text_message(conversation_id: str, request: TextMessageRequest):
 
     Use this when the WebRTC realtime session is not active.
     """
-    logger.info(f"[TextMessage] Received text message for conversation {conversation_id}")
+    logger.info("[TextMessage] Received text message for conversation %s", conversation_id)
 
     # Verify conversation exists
-    conversation = conversation_store.get_conversation(conversation_id)
+    _require_valid_conversation_id(conversation_id)
+    conversation = await run_store_call(conversation_store.get_conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -943,8 +1158,8 @@ async def send_text_message(conversation_id: str, request: TextMessageRequest):
         memory_file_path=memory_file_path,
     )
 
-    # Get conversation history
-    events = conversation_store.list_events(conversation_id, limit=100)
+    # Get conversation history (most recent events, served from memory)
+    events = await run_store_call(conversation_store.recent_events, conversation_id, limit=100)
 
     # Create audio chat handler
     handler = AudioChatHandler(
@@ -961,7 +1176,10 @@ async def send_text_message(conversation_id: str, request: TextMessageRequest):
             include_audio=request.include_audio
         )
 
-        logger.info(f"[TextMessage] Got response: {len(text_response)} chars text, audio={'yes' if audio_response else 'no'}, tools={len(tool_calls) if tool_calls else 0}")
+        logger.info(
+            "[TextMessage] Got response: %d chars text, audio=%s, tools=%d",
+            len(text_response), "yes" if audio_response else "no", len(tool_calls) if tool_calls else 0,
+        )
 
         # Store and broadcast user text event
         await _store_and_broadcast_event(
@@ -995,5 +1213,5 @@ async def send_text_message(conversation_id: str, request: TextMessageRequest):
         )
 
     except Exception as exc:
-        logger.error(f"[TextMessage] Failed to process text: {exc}")
+        logger.error("[TextMessage] Failed to process text: %s", exc)
         raise HTTPException(status_code=500, detail=f"Failed to process text: {exc}")
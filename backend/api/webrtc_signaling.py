@@ -5,42 +5,150 @@ Provides signaling (SDP offer/answer exchange and ICE candidate exchange)
 for peer-to-peer WebRTC audio connections between desktop and mobile.
 """
 
+import asyncio
 import logging
-from typing import Dict, Set
+from typing import Dict, Optional, Tuple
+
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+# Signaling message types
+_REGISTER = 'register'
+_ICE_CANDIDATE = 'ice-candidate'
+_RELAY_TYPES = frozenset(('offer', 'answer', _ICE_CANDIDATE))
+
+# Frames buffered per peer; when full, the oldest ICE candidate is dropped
+PEER_QUEUE_MAXSIZE = 64
+
 class WebRTCSignalingRoom:
     """Manages WebRTC signaling for a single conversation"""
 
     def __init__(self, conversation_id: str):
         self.conversation_id = conversation_id
         self.peers: Dict[str, WebSocket] = {}  # peerId -> WebSocket
+        # Outgoing frames per peer, each drained to its socket by a writer task,
+        # so a slow peer never blocks the sender's receive loop
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        # In the usual two-peer room, each peerId -> (otherPeerId, its queue)
+        self._counterpart: Dict[str, Tuple[str, asyncio.Queue]] = {}
+        # Close tasks for peers whose queue overflowed with frames that can't be dropped
+        self._closing: Dict[str, asyncio.Task] = {}
+
+    def _refresh_counterparts(self):
+        """Rebuild the peer pairing after the room's membership changes"""
+        if len(self._queues) == 2:
+            (a_id, a_queue), (b_id, b_queue) = self._queues.items()
+            self._counterpart = {a_id: (b_id, b_queue), b_id: (a_id, a_queue)}
+        else:
+            self._counterpart = {}
+
+    def _stop_writer(self, peer_id: str):
+        self._queues.pop(peer_id, None)
+        writer = self._writers.pop(peer_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
 
     async def register_peer(self, peer_id: str, websocket: WebSocket):
         """Register a peer in this room"""
+        # A peer re-registering on a new socket replaces its old writer
+        self._stop_writer(peer_id)
         self.peers[peer_id] = websocket
-        logger.info(f"[WebRTC Signaling] Peer '{peer_id}' joined conversation {self.conversation_id}")
-        logger.info(f"[WebRTC Signaling] Active peers: {list(self.peers.keys())}")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PEER_QUEUE_MAXSIZE)
+        self._queues[peer_id] = queue
+        self._writers[peer_id] = asyncio.create_task(self._write_to_peer(peer_id, websocket, queue))
+        self._refresh_counterparts()
+        logger.info("[WebRTC Signaling] Peer '%s' joined conversation %s", peer_id, self.conversation_id)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[WebRTC Signaling] Active peers: %s", list(self.peers))
 
     async def unregister_peer(self, peer_id: str):
         """Unregister a peer from this room"""
         if peer_id in self.peers:
             del self.peers[peer_id]
-            logger.info(f"[WebRTC Signaling] Peer '{peer_id}' left conversation {self.conversation_id}")
-            logger.info(f"[WebRTC Signaling] Active peers: {list(self.peers.keys())}")
-
-    async def relay_message(self, from_peer_id: str, message: dict):
-        """Relay signaling message to the other peer"""
-        # Send to all peers except the sender
-        for peer_id, websocket in self.peers.items():
+            self._stop_writer(peer_id)
+            self._refresh_counterparts()
+            logger.info("[WebRTC Signaling] Peer '%s' left conversation %s", peer_id, self.conversation_id)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[WebRTC Signaling] Active peers: %s", list(self.peers))
+
+    async def _drop_dead_peer(self, peer_id: str, websocket: WebSocket):
+        """Unregister a peer whose socket failed a send, unless it has since re-registered"""
+        if self.peers.get(peer_id) is websocket:
+            await self.unregister_peer(peer_id)
+            signaling_manager.cleanup_room(self.conversation_id)
+
+    async def _write_to_peer(self, peer_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain a peer's queued frames to its socket"""
+        try:
+            while True:
+                payload, message_type = await queue.get()
+                await websocket.send_text(payload)
+                logger.debug("[WebRTC Signaling] Relayed %s to %s", message_type, peer_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("[WebRTC Signaling] Failed to relay to %s: %s", peer_id, e)
+            await self._drop_dead_peer(peer_id, websocket)
+
+    async def _close_stalled_peer(self, peer_id: str, websocket: WebSocket):
+        """Close a peer that stopped reading, so its client reconnects and renegotiates"""
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+        await self._drop_dead_peer(peer_id, websocket)
+
+    def _enqueue(self, peer_id: str, queue: asyncio.Queue, payload: str, message_type: Optional[str]):
+        try:
+            queue.put_nowait((payload, message_type))
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # Full: drop the oldest ICE candidate (queued or this one). Offers and
+        # answers are never dropped, since losing one breaks the session.
+        frames = [queue.get_nowait() for _ in range(queue.qsize())]
+        for index, (_, queued_type) in enumerate(frames):
+            if queued_type == _ICE_CANDIDATE:
+                del frames[index]
+                frames.append((payload, message_type))
+                break
+        else:
+            if message_type != _ICE_CANDIDATE:
+                websocket = self.peers.get(peer_id)
+                if websocket is not None and peer_id not in self._closing:
+                    logger.warning("[WebRTC Signaling] Queue full for %s with no ICE candidate to drop; closing peer", peer_id)
+                    self._stop_writer(peer_id)
+                    # Stop routing relays into the orphaned queue while the close runs
+                    self._refresh_counterparts()
+                    task = asyncio.create_task(self._close_stalled_peer(peer_id, websocket))
+                    self._closing[peer_id] = task
+                    task.add_done_callback(lambda _: self._closing.pop(peer_id, None))
+                return
+        for frame in frames:
+            queue.put_nowait(frame)
+        logger.warning("[WebRTC Signaling] Queue full for %s; dropped oldest ICE candidate", peer_id)
+
+    def send_to_peer(self, peer_id: str, payload: str, message_type: Optional[str] = None):
+        """Queue a frame for one peer, behind anything already relayed to it"""
+        queue = self._queues.get(peer_id)
+        if queue is not None:
+            self._enqueue(peer_id, queue, payload, message_type)
+
+    async def relay_message(self, from_peer_id: str, payload: str, message_type: Optional[str] = None):
+        """Relay a signaling frame, as received, to the other peer"""
+        # The payload is forwarded verbatim as text: the browser peers
+        # JSON.parse the frame data, which a binary frame would break.
+        counterpart = self._counterpart.get(from_peer_id)
+        if counterpart is not None:
+            self._enqueue(counterpart[0], counterpart[1], payload, message_type)
+            return
+        for peer_id, queue in self._queues.items():
             if peer_id != from_peer_id:
-                try:
-                    await websocket.send_json(message)
-                    logger.debug(f"[WebRTC Signaling] Relayed {message.get('type')} from {from_peer_id} to {peer_id}")
-                except Exception as e:
-                    logger.error(f"[WebRTC Signaling] Failed to relay to {peer_id}: {e}")
+                self._enqueue(peer_id, queue, payload, message_type)
 
     def is_empty(self) -> bool:
         """Check if room has no peers"""
@@ -87,26 +195,28 @@ async def handle_webrtc_signaling(websocket: WebSocket, conversation_id: str):
 
     try:
         while True:
-            # Receive signaling message
-            message = await websocket.receive_json()
+            # Receive signaling message; the raw text is what gets relayed
+            raw = await websocket.receive_text()
+            message = orjson.loads(raw)
             message_type = message.get('type')
 
-            if message_type == 'register':
+            if message_type == _REGISTER:
                 # Register peer in room
                 peer_id = message.get('peerId', 'unknown')
                 await room.register_peer(peer_id, websocket)
 
-                # Send acknowledgment
-                await websocket.send_json({
+                # Send acknowledgment through the peer's queue, so the writer
+                # task stays the only sender on this socket
+                room.send_to_peer(peer_id, orjson.dumps({
                     'type': 'registered',
                     'peerId': peer_id,
                     'activePeers': list(room.peers.keys())
-                })
+                }).decode(), 'registered')
 
-            elif message_type in ['offer', 'answer', 'ice-candidate']:
+            elif message_type in _RELAY_TYPES:
                 # Relay signaling message to other peer(s)
                 if peer_id:
-                    await room.relay_message(peer_id, message)
+                    await room.relay_message(peer_id, raw, message_type)
                 else:
                     logger.warning(f"[WebRTC Signaling] Received {message_type} before registration")
 
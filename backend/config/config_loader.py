@@ -1,17 +1,67 @@
-import os, importlib.util, json, inspect
+import os, importlib.util, tempfile, weakref
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from typing import List, Tuple, Dict, Any, Optional
+from pydantic import TypeAdapter, ValidationError
 from config.schemas import AgentConfig, ToolInfo, VoiceConfig
 from autogen_core.tools import FunctionTool
 
+# Schemas keyed weakly by tool, so entries go away with tools dropped on reload
+_SCHEMA_CACHE: "weakref.WeakKeyDictionary[FunctionTool, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
 # Function to extract schema from FunctionTool (simplified)
 def _get_tool_schema(tool: FunctionTool) -> Dict[str, Any]:
+    cached = _SCHEMA_CACHE.get(tool)
+    if cached is not None:
+        return cached
     # FunctionTool often exposes schema via methods like .openai_schema or similar
     # This is a placeholder, actual method might differ based on autogen-core version
     if hasattr(tool, 'openai_schema'):
-        return tool.openai_schema
-    # Fallback or simplified representation if schema method isn't available/stable
-    # Inspecting the function signature could be an alternative
-    return {"parameters": {"type": "object", "properties": {}}} # Basic fallback
+        schema = tool.openai_schema
+    else:
+        # Fallback or simplified representation if schema method isn't available/stable
+        # Inspecting the function signature could be an alternative
+        schema = {"parameters": {"type": "object", "properties": {}}} # Basic fallback
+    _SCHEMA_CACHE[tool] = schema
+    return schema
+
+# Tools loaded per module file, keyed by path -> (st_mtime_ns, st_size, tools).
+# load_tools runs on every tools listing and agent run; an unchanged file is
+# not re-executed.
+_TOOL_MODULE_CACHE: Dict[str, Tuple[int, int, List[FunctionTool]]] = {}
+
+def _exec_tool_module(module_name: str, fname: str, file_path: str) -> Optional[List[FunctionTool]]:
+    """Execute a tool module and return the FunctionTool instances it defines."""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if not (spec and spec.loader): # Check if spec and loader are valid
+        print(f"Warning: Could not create spec for module '{module_name}' from '{fname}'. Skipping.")
+        return None
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    print(f"  Successfully executed module: {module_name}") # LOGGING
+
+    # Iterate through the module namespace in definition order; unlike
+    # inspect.getmembers this doesn't sort or getattr every name
+    tools: List[FunctionTool] = []
+    for name, obj in list(vars(mod).items()):
+        if name.startswith('__'):
+            continue
+        # Look for FunctionTool instances
+        if isinstance(obj, FunctionTool):
+            print(f"    Found FunctionTool instance: '{name}' in {fname}") # LOGGING
+            # FunctionTool already links the function
+            tools.append(obj)
+    if not tools:
+         print(f"  No FunctionTool instances found in {fname}") # LOGGING
+    return tools
+
+def _load_tool_module(args: Tuple[str, str, str]) -> Tuple[Optional[List[FunctionTool]], Optional[Exception]]:
+    module_name, fname, file_path = args
+    print(f"Attempting to load module: {module_name} from {file_path}") # LOGGING
+    try:
+        return _exec_tool_module(module_name, fname, file_path), None
+    except Exception as e:
+        return None, e
 
 def load_tools(tools_dir: str) -> List[Tuple[FunctionTool, str]]:
     """Loads FunctionTool instances and their source filenames."""
@@ -19,40 +69,48 @@ def load_tools(tools_dir: str) -> List[Tuple[FunctionTool, str]]:
     tools_with_filenames: List[Tuple[FunctionTool, str]] = []
     os.makedirs(tools_dir, exist_ok=True) # Ensure tools dir exists
     try:
-        file_list = os.listdir(tools_dir)
-        print(f"Found files/dirs: {file_list}") # LOGGING
+        with os.scandir(tools_dir) as it:
+            entries = list(it)
+        print(f"Found files/dirs: {[entry.name for entry in entries]}") # LOGGING
     except Exception as e:
         print(f"Error listing directory {tools_dir}: {e}")
         return []
 
-    for fname in file_list:
+    # Stat every tool file; only new or changed modules get executed
+    tool_files: List[Tuple[str, str, Tuple[int, int]]] = []
+    pending: List[Tuple[str, str, str]] = []
+    for entry in entries:
+        fname = entry.name
         if fname.endswith('.py') and fname != '__init__.py':
-            module_name = fname[:-3]
             file_path = os.path.join(tools_dir, fname)
-            print(f"Attempting to load module: {module_name} from {file_path}") # LOGGING
             try:
-                spec = importlib.util.spec_from_file_location(module_name, file_path)
-                if spec and spec.loader: # Check if spec and loader are valid
-                    mod = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(mod)
-                    print(f"  Successfully executed module: {module_name}") # LOGGING
-
-                    # Iterate through all members of the loaded module
-                    found_tools_in_file = 0 # LOGGING
-                    for name, obj in inspect.getmembers(mod):
-                        # Look for FunctionTool instances
-                        if isinstance(obj, FunctionTool):
-                            print(f"    Found FunctionTool instance: '{name}' in {fname}") # LOGGING
-                            # FunctionTool already links the function
-                            tools_with_filenames.append((obj, fname))
-                            found_tools_in_file += 1 # LOGGING
-                    if found_tools_in_file == 0:
-                         print(f"  No FunctionTool instances found in {fname}") # LOGGING
-                else:
-                    print(f"Warning: Could not create spec for module '{module_name}' from '{fname}'. Skipping.")
-
-            except Exception as e:
+                st = entry.stat()
+            except OSError as e:
                 print(f"Warning: Failed to load tools from '{fname}': {e}")
+                continue
+            key = (st.st_mtime_ns, st.st_size)
+            tool_files.append((fname, file_path, key))
+            cached = _TOOL_MODULE_CACHE.get(file_path)
+            if cached is None or cached[:2] != key:
+                pending.append((fname[:-3], fname, file_path))
+
+    if pending:
+        # Executed one at a time: tool modules configure logging, create
+        # directories and import heavy packages at import time, and concurrent
+        # first imports of the same package can fail or deadlock
+        results = [_load_tool_module(args) for args in pending]
+        stat_keys = {file_path: key for _, file_path, key in tool_files}
+        for (module_name, fname, file_path), (tools, error) in zip(pending, results):
+            if error is not None:
+                _TOOL_MODULE_CACHE.pop(file_path, None)
+                print(f"Warning: Failed to load tools from '{fname}': {error}")
+            elif tools is not None:
+                _TOOL_MODULE_CACHE[file_path] = (*stat_keys[file_path], tools)
+
+    for fname, file_path, key in tool_files:
+        cached = _TOOL_MODULE_CACHE.get(file_path)
+        if cached is not None and cached[:2] == key:
+            tools_with_filenames.extend((tool, fname) for tool in cached[2])
 
     if not tools_with_filenames:
          print(f"--- No valid FunctionTool instances found in '{tools_dir}'. ---") # LOGGING
@@ -61,75 +119,147 @@ def load_tools(tools_dir: str) -> List[Tuple[FunctionTool, str]]:
          print(f"--- Finished loading tools. Found: {tool_names} ---") # LOGGING
     return tools_with_filenames
 
+# Process umask, read once: new files written by _write_atomic get the same
+# mode a plain open() would have given them (mkstemp creates them 0600).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _write_atomic(path: str, content: bytes):
+    """Write to a unique sibling temp file and rename it over path, so readers never see a partial file.
+
+    Save handlers run concurrently in the threadpool, so each write gets its own
+    temp file; the data is fsynced before the rename and the file keeps its mode.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _dump_json(data: Any) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
 def save_tool(tools_dir: str, filename: str, content: bytes):
     os.makedirs(tools_dir, exist_ok=True)
     path = os.path.join(tools_dir, filename)
-    with open(path, 'wb') as f:
-        f.write(content)
+    _write_atomic(path, content)
 
-def load_agents(agents_dir: str) -> List[AgentConfig]:
-    agents: List[AgentConfig] = []
-    os.makedirs(agents_dir, exist_ok=True)
-    for fname in os.listdir(agents_dir):
-        if not fname.endswith('.json'):
+def _read_file_entry(entry: os.DirEntry) -> Tuple[str, Optional[bytes]]:
+    try:
+        with open(entry.path, 'rb') as f:
+            return entry.name, f.read()
+    except OSError as e:
+        print(f"Warning: Could not read {entry.name}: {e}")
+        return entry.name, None
+
+def _read_json_files(directory: str) -> List[Tuple[str, Optional[bytes]]]:
+    """Read the raw bytes of every .json file in a directory, in parallel."""
+    os.makedirs(directory, exist_ok=True)
+    with os.scandir(directory) as it:
+        entries = [entry for entry in it if entry.name.endswith('.json') and entry.is_file()]
+    if not entries:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(entries))) as pool:
+        return list(pool.map(_read_file_entry, entries))
+
+def _parse_json_files(directory: str) -> Dict[str, Any]:
+    """Parse every .json file in a directory into a {name: data} index."""
+    raw_by_name: Dict[str, Any] = {}
+    for fname, raw in _read_json_files(directory):
+        if raw is None:
             continue
         try:
-            path = os.path.join(agents_dir, fname)
-            with open(path) as f:
-                data = json.load(f)
-            # For nested_team, expand sub_agents list of filenames to full configs
-            if data.get('agent_type') == 'nested_team' and isinstance(data.get('sub_agents'), list):
-                names = data['sub_agents']
-                expanded: List[AgentConfig] = []
-                for item in names:
-                    if isinstance(item, str):
-                        sub_path = os.path.join(agents_dir, f"{item}.json")
-                        try:
-                            with open(sub_path) as sf:
-                                sub_data = json.load(sf)
-                            # Recursively expand if this sub-agent is also a nested_team
-                            if sub_data.get('agent_type') == 'nested_team' and isinstance(sub_data.get('sub_agents'), list):
-                                sub_names = sub_data['sub_agents']
-                                sub_expanded: List[AgentConfig] = []
-                                for sub_item in sub_names:
-                                    if isinstance(sub_item, str):
-                                        sub_sub_path = os.path.join(agents_dir, f"{sub_item}.json")
-                                        try:
-                                            with open(sub_sub_path) as ssf:
-                                                sub_sub_data = json.load(ssf)
-                                            sub_expanded.append(AgentConfig(**sub_sub_data))
-                                        except Exception as e:
-                                            print(f"Warning: Could not load nested sub-agent '{sub_item}': {e}")
-                                    elif isinstance(sub_item, dict):
-                                        sub_expanded.append(AgentConfig(**sub_item))
-                                sub_data['sub_agents'] = sub_expanded
-                            expanded.append(AgentConfig(**sub_data))
-                        except Exception as e:
-                            print(f"Warning: Could not load sub-agent '{item}': {e}")
-                    elif isinstance(item, dict):
-                        expanded.append(AgentConfig(**item))
-                data['sub_agents'] = expanded
-            agents.append(AgentConfig(**data))
-        except json.JSONDecodeError:
+            raw_by_name[fname[:-5]] = orjson.loads(raw)
+        except orjson.JSONDecodeError:
             print(f"Warning: Could not decode JSON from {fname}")
+    return raw_by_name
+
+def _expand_sub_agents(data: Dict[str, Any], raw_by_name: Dict[str, Any], visiting: frozenset) -> Dict[str, Any]:
+    """Return a copy of a nested_team agent's data with sub_agents names resolved to AgentConfigs."""
+    if data.get('agent_type') != 'nested_team' or not isinstance(data.get('sub_agents'), list):
+        return data
+    expanded: List[AgentConfig] = []
+    for item in data['sub_agents']:
+        if isinstance(item, str):
+            if item in visiting:
+                print(f"Warning: Skipping sub-agent '{item}': circular nested_team reference")
+                continue
+            try:
+                # Recursively expand if this sub-agent is also a nested_team
+                sub_data = _expand_sub_agents(raw_by_name[item], raw_by_name, visiting | {item})
+                expanded.append(AgentConfig(**sub_data))
+            except Exception as e:
+                print(f"Warning: Could not load sub-agent '{item}': {e}")
+        elif isinstance(item, dict):
+            expanded.append(AgentConfig(**item))
+    # Copy rather than mutate: other agents resolve this entry from the index
+    return {**data, 'sub_agents': expanded}
+
+_AGENT_LIST_ADAPTER = TypeAdapter(List[AgentConfig])
+_VOICE_CONFIG_LIST_ADAPTER = TypeAdapter(List[VoiceConfig])
+
+def _validate_configs(adapter: TypeAdapter, model: type, items: List[Tuple[str, Any]], kind: str) -> list:
+    """Validate a directory's configs in one pass, falling back to one at a time so a bad file only drops itself."""
+    try:
+        return adapter.validate_python([data for _, data in items])
+    except ValidationError:
+        pass
+    configs = []
+    for name, data in items:
+        try:
+            configs.append(model.model_validate(data))
+        except Exception as e:
+            print(f"Warning: Could not load {kind} from {name}.json: {e}")
+    return configs
+
+def load_agents(agents_dir: str) -> List[AgentConfig]:
+    expanded: List[Tuple[str, Any]] = []
+    # First pass reads every agent file once; nested_team sub_agents then
+    # resolve from this index instead of re-opening files
+    raw_by_name = _parse_json_files(agents_dir)
+    for name, data in raw_by_name.items():
+        try:
+            # For nested_team, expand sub_agents list of filenames to full configs
+            expanded.append((name, _expand_sub_agents(data, raw_by_name, frozenset((name,)))))
         except Exception as e:
-            print(f"Warning: Could not load agent from {fname}: {e}")
-    return agents
+            print(f"Warning: Could not load agent from {name}.json: {e}")
+    return _validate_configs(_AGENT_LIST_ADAPTER, AgentConfig, expanded, "agent")
 
 def save_agent(cfg: AgentConfig, agents_dir: str):
     path = os.path.join(agents_dir, f"{cfg.name}.json")
+    data = cfg.model_dump(mode='json')
     if cfg.agent_type == 'nested_team' and cfg.sub_agents:
         # Only save filenames (agent names) for sub_agents to avoid redundancy
-        data = cfg.model_dump()
         data['sub_agents'] = [sub.name for sub in cfg.sub_agents]
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
-    else:
-        with open(path, 'w') as f:
-            f.write(cfg.model_dump_json(indent=2))
+    _write_atomic(path, _dump_json(data))
+
+# Last get_tool_infos result with the (tool, filename) pairs it was built from.
+# load_tools hands back the same FunctionTool objects until a module changes.
+_TOOL_INFO_CACHE: Optional[Tuple[List[Tuple[FunctionTool, str]], List[ToolInfo]]] = None
 
 def get_tool_infos(loaded_tools: List[Tuple[FunctionTool, str]]) -> List[ToolInfo]:
     """Converts loaded FunctionTools into ToolInfo for API responses."""
+    global _TOOL_INFO_CACHE
+    cached = _TOOL_INFO_CACHE
+    if cached is not None and len(cached[0]) == len(loaded_tools) and all(
+        tool is cached_tool and filename == cached_filename
+        for (tool, filename), (cached_tool, cached_filename) in zip(loaded_tools, cached[0])
+    ):
+        return cached[1]
     tool_infos = []
     for tool, filename in loaded_tools:
         tool_infos.append(ToolInfo(
@@ -138,37 +268,38 @@ def get_tool_infos(loaded_tools: List[Tuple[FunctionTool, str]]) -> List[ToolInf
             parameters=_get_tool_schema(tool), # Get schema from FunctionTool
             filename=filename
         ))
+    _TOOL_INFO_CACHE = (list(loaded_tools), tool_infos)
     return tool_infos
 
 # Voice Configuration Functions
 
+# Parsed voice configs and prompt texts, keyed by path -> (st_mtime_ns, value).
+# They are read on every voice session start but rarely change.
+_VOICE_CFG_CACHE: Dict[str, Tuple[int, VoiceConfig]] = {}
+_VOICE_PROMPT_CACHE: Dict[str, Tuple[int, str]] = {}
+
 def load_voice_configs(voice_configs_dir: str) -> List[VoiceConfig]:
     """Load all voice configurations from the voice_configs directory."""
-    configs: List[VoiceConfig] = []
-    os.makedirs(voice_configs_dir, exist_ok=True)
-    for fname in os.listdir(voice_configs_dir):
-        if not fname.endswith('.json'):
-            continue
-        try:
-            path = os.path.join(voice_configs_dir, fname)
-            with open(path) as f:
-                data = json.load(f)
-            configs.append(VoiceConfig(**data))
-        except json.JSONDecodeError:
-            print(f"Warning: Could not decode JSON from {fname}")
-        except Exception as e:
-            print(f"Warning: Could not load voice config from {fname}: {e}")
-    return configs
+    items = list(_parse_json_files(voice_configs_dir).items())
+    return _validate_configs(_VOICE_CONFIG_LIST_ADAPTER, VoiceConfig, items, "voice config")
 
 def load_voice_config(voice_configs_dir: str, name: str) -> Optional[VoiceConfig]:
     """Load a specific voice configuration by name."""
     path = os.path.join(voice_configs_dir, f"{name}.json")
-    if not os.path.exists(path):
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        _VOICE_CFG_CACHE.pop(path, None)
         return None
+    cached = _VOICE_CFG_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
     try:
-        with open(path) as f:
-            data = json.load(f)
-        return VoiceConfig(**data)
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        config = VoiceConfig(**data)
+        _VOICE_CFG_CACHE[path] = (mtime_ns, config)
+        return config
     except Exception as e:
         print(f"Error loading voice config '{name}': {e}")
         return None
@@ -177,18 +308,19 @@ def save_voice_config(cfg: VoiceConfig, voice_configs_dir: str):
     """Save a voice configuration."""
     os.makedirs(voice_configs_dir, exist_ok=True)
     path = os.path.join(voice_configs_dir, f"{cfg.name}.json")
-    with open(path, 'w') as f:
-        f.write(cfg.model_dump_json(indent=2))
+    _write_atomic(path, _dump_json(cfg.model_dump(mode='json')))
+    _VOICE_CFG_CACHE.pop(path, None)
 
 def delete_voice_config(voice_configs_dir: str, name: str) -> bool:
     """Delete a voice configuration by name."""
     path = os.path.join(voice_configs_dir, f"{name}.json")
-    if not os.path.exists(path):
-        return False
+    _VOICE_CFG_CACHE.pop(path, None)
     try:
-        os.remove(path)
+        os.unlink(path)
         return True
-    except Exception as e:
+    except FileNotFoundError:
+        return False
+    except OSError as e:
         print(f"Error deleting voice config '{name}': {e}")
         return False
 
@@ -200,11 +332,19 @@ def load_voice_prompts(voice_prompts_dir: str) -> List[str]:
 def load_voice_prompt(voice_prompts_dir: str, filename: str) -> Optional[str]:
     """Load the content of a voice prompt file."""
     path = os.path.join(voice_prompts_dir, filename)
-    if not os.path.exists(path):
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        _VOICE_PROMPT_CACHE.pop(path, None)
         return None
+    cached = _VOICE_PROMPT_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
     try:
         with open(path, 'r') as f:
-            return f.read()
+            content = f.read()
+        _VOICE_PROMPT_CACHE[path] = (mtime_ns, content)
+        return content
     except Exception as e:
         print(f"Error loading voice prompt '{filename}': {e}")
         return None
@@ -216,17 +356,18 @@ def save_voice_prompt(voice_prompts_dir: str, filename: str, content: str):
     if not filename.endswith(('.txt', '.md')):
         filename = filename + '.txt'
     path = os.path.join(voice_prompts_dir, filename)
-    with open(path, 'w') as f:
-        f.write(content)
+    _write_atomic(path, content.encode('utf-8'))
+    _VOICE_PROMPT_CACHE.pop(path, None)
 
 def delete_voice_prompt(voice_prompts_dir: str, filename: str) -> bool:
     """Delete a voice prompt file."""
     path = os.path.join(voice_prompts_dir, filename)
-    if not os.path.exists(path):
-        return False
+    _VOICE_PROMPT_CACHE.pop(path, None)
     try:
-        os.remove(path)
+        os.unlink(path)
         return True
-    except Exception as e:
+    except FileNotFoundError:
+        return False
+    except OSError as e:
         print(f"Error deleting voice prompt '{filename}': {e}")
         return False
\ No newline at end of file
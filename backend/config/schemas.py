@@ -58,7 +58,7 @@ class AgentConfig(BaseSchema):
     include_inner_dialog: bool = Field(default=True, description="Include inner dialog messages in the response for nested team agents.")
 
 # Resolve forward references for recursive sub_agents
-AgentConfig.update_forward_refs()
+AgentConfig.model_rebuild()
 
 class GenerateToolRequest(BaseSchema):
     prompt: str = Field(..., description="The natural language prompt describing the tool to be generated.")
@@ -102,21 +102,22 @@ class BaseChatMessage(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     type: str = "TextMessage"
 
-    class Config:
-        json_encoders = {
-            # Add any custom serializers here
-            'BaseModel': lambda x: x.dict()
-        }
-        extra = "allow"  # Allow extra fields
-        validate_assignment = True
-        arbitrary_types_allowed = True
+    # No __slots__: pydantic v2 models keep field values in __dict__ and
+    # have no slots option, so only the v1-style Config is replaced here
+    model_config = ConfigDict(
+        extra="allow",  # Allow extra fields
+        validate_assignment=True,
+        arbitrary_types_allowed=True,
+    )
 
     def model_dump(self, **kwargs):
-        # Ensure consistent serialization
+        # Ensure consistent serialization; read the field values straight
+        # from the instance dict rather than one attribute lookup each
+        fields = self.__dict__
         return {
-            "content": self.content,
-            "source": self.source,
-            "models_usage": self.models_usage,
-            "metadata": self.metadata,
-            "type": self.type
+            "content": fields["content"],
+            "source": fields["source"],
+            "models_usage": fields["models_usage"],
+            "metadata": fields["metadata"],
+            "type": fields["type"]
         }
\ No newline at end of file
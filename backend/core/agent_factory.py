@@ -6,23 +6,162 @@ based on a uniform AgentConfig schema.
 """
 
 import os
-from typing import List
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, List
 from config.schemas import AgentConfig
 from autogen_core.tools import FunctionTool
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
-from core.looping_agent import LoopingAssistantAgent
-from core.looping_code_executor_agent import LoopingCodeExecutorAgent
-from core.multimodal_tools_looping_agent import MultimodalToolsLoopingAgent
-from core.dynamic_init_looping_agent import DynamicInitLoopingAgent
-from core.custom_loop_agent import CustomLoopAgent
-from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+from autogen_agentchat.agents import AssistantAgent
+
+# The specialised agent classes and the local code executor are imported in
+# the builder that uses them: each call builds one agent type, so there is no
+# reason to pay for the others at import time.
+if TYPE_CHECKING:
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+
+# Local executors by resolved work_dir, shared while any agent still holds one
+_LOCAL_EXECUTORS: "weakref.WeakValueDictionary[str, object]" = weakref.WeakValueDictionary()
+
+
+def _get_local_executor(work_dir: str):
+    work_dir = os.path.realpath(work_dir)
+    executor = _LOCAL_EXECUTORS.get(work_dir)
+    if executor is None:
+        from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+        executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
+        _LOCAL_EXECUTORS[work_dir] = executor
+    return executor
+
+
+def _resolve_code_executor(agent_cfg: AgentConfig):
+    """Build the code executor described by agent_cfg.code_executor."""
+    ce_cfg = agent_cfg.code_executor or {}
+    ce_type = ce_cfg.get('type')
+    if ce_type == 'local':
+        return _get_local_executor(ce_cfg.get('work_dir') or os.getcwd())
+    raise ValueError(f"Unsupported code_executor type: {ce_type}")
+
+
+def _build_nested_team(agent_cfg, agent_tools, all_tools, model_client):
+    # Nested team agent: import locally to avoid circular import
+    from core.nested_agent import NestedTeamAgent
+    # Include flag for inner dialog in nested team agent config
+    return NestedTeamAgent.from_config(agent_cfg, all_tools, model_client)
+
+
+def _build_code_executor(agent_cfg, agent_tools, all_tools, model_client):
+    from autogen_agentchat.agents import CodeExecutorAgent
+    code_executor = _resolve_code_executor(agent_cfg)
+    # Always provide model_client to enable code generation; streaming controlled by model_client_stream
+    return CodeExecutorAgent(
+        name=agent_cfg.name,
+        code_executor=code_executor,
+        model_client=model_client,
+        system_message=agent_cfg.system_message,
+        description=agent_cfg.description,
+        sources=agent_cfg.sources,
+        model_client_stream=agent_cfg.model_client_stream
+    )
+
+
+def _build_looping(agent_cfg, agent_tools, all_tools, model_client):
+    from core.looping_agent import LoopingAssistantAgent
+    return LoopingAssistantAgent(
+        name=agent_cfg.name,
+        description=agent_cfg.description,
+        system_message=agent_cfg.prompt.system,
+        model_client=model_client,
+        tools=agent_tools,
+        reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
+        max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
+    )
+
+
+def _build_looping_code_executor(agent_cfg, agent_tools, all_tools, model_client):
+    from core.looping_code_executor_agent import LoopingCodeExecutorAgent
+    code_executor = _resolve_code_executor(agent_cfg)
+    return LoopingCodeExecutorAgent(
+        name=agent_cfg.name,
+        code_executor=code_executor,
+        model_client=model_client,
+        system_message=agent_cfg.system_message,
+        description=agent_cfg.description,
+        sources=agent_cfg.sources,
+        model_client_stream=agent_cfg.model_client_stream,
+        max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
+    )
+
+
+def _build_multimodal_tools_looping(agent_cfg, agent_tools, all_tools, model_client):
+    from core.multimodal_tools_looping_agent import MultimodalToolsLoopingAgent
+    return MultimodalToolsLoopingAgent(
+        name=agent_cfg.name,
+        description=agent_cfg.description,
+        system_message=agent_cfg.prompt.system,
+        model_client=model_client,
+        tools=agent_tools,
+        reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
+        max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
+    )
+
+
+def _build_dynamic_init_looping(agent_cfg, agent_tools, all_tools, model_client):
+    from core.dynamic_init_looping_agent import DynamicInitLoopingAgent
+    return DynamicInitLoopingAgent(
+        name=agent_cfg.name,
+        description=agent_cfg.description,
+        system_message=agent_cfg.prompt.system,
+        model_client=model_client,
+        tools=agent_tools,
+        reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
+        max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply,
+        initialization_function=agent_cfg.initialization_function
+    )
+
+
+def _build_custom_loop(agent_cfg, agent_tools, all_tools, model_client):
+    # Custom loop agent with output handler
+    from core.custom_loop_agent import CustomLoopAgent
+    return CustomLoopAgent(
+        name=agent_cfg.name,
+        description=agent_cfg.description,
+        system_message=agent_cfg.prompt.system,
+        model_client=model_client,
+        tools=agent_tools,
+        output_handler=agent_cfg.output_handler,
+        output_handler_config=agent_cfg.output_handler_config or {},
+        max_iterations=agent_cfg.max_consecutive_auto_reply
+    )
+
+
+def _build_assistant(agent_cfg, agent_tools, all_tools, model_client):
+    # Default: standard AssistantAgent
+    return AssistantAgent(
+        name=agent_cfg.name,
+        description=agent_cfg.description,
+        system_message=agent_cfg.prompt.system,
+        model_client=model_client,
+        tools=agent_tools,
+    )
+
+
+# agent_type -> builder(agent_cfg, agent_tools, all_tools, model_client).
+# Unlisted types (including 'assistant') build a plain AssistantAgent.
+_BUILDERS: Dict[str, Callable[..., AssistantAgent]] = {
+    "nested_team": _build_nested_team,
+    "code_executor": _build_code_executor,
+    "looping": _build_looping,
+    "looping_code_executor": _build_looping_code_executor,
+    "multimodal_tools_looping": _build_multimodal_tools_looping,
+    "dynamic_init_looping": _build_dynamic_init_looping,
+    "custom_loop": _build_custom_loop,
+}
 
 
 def create_agent_from_config(
     agent_cfg: AgentConfig,
     all_tools: List[FunctionTool],
-    model_client: OpenAIChatCompletionClient
+    model_client: "OpenAIChatCompletionClient"
 ) -> AssistantAgent:
     """
     Instantiate and return an Agent instance matching the given configuration.
@@ -36,110 +175,9 @@ def create_agent_from_config(
         AssistantAgent: An instance of the requested agent type (AssistantAgent, LoopingAssistantAgent,
                         CodeExecutorAgent, or NestedTeamAgent).
     """
-    # Filter tools for this agent
-    agent_tools = [t for t in all_tools if t.name in (agent_cfg.tools or [])]
+    # Filter tools for this agent with one set lookup per available tool
+    wanted = frozenset(agent_cfg.tools or ())
+    agent_tools = [t for t in all_tools if t.name in wanted] if wanted else []
 
-    # Nested team agent: import locally to avoid circular import
-    if agent_cfg.agent_type == "nested_team":
-        from core.nested_agent import NestedTeamAgent
-        # Include flag for inner dialog in nested team agent config
-        return NestedTeamAgent.from_config(agent_cfg, all_tools, model_client)
-
-    # Code executor agent
-    if agent_cfg.agent_type == "code_executor":
-        ce_cfg = agent_cfg.code_executor or {}
-        ce_type = ce_cfg.get('type')
-        if ce_type == 'local':
-            work_dir = ce_cfg.get('work_dir') or os.getcwd()
-            code_executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
-        else:
-            raise ValueError(f"Unsupported code_executor type: {ce_type}")
-        # Always provide model_client to enable code generation; streaming controlled by model_client_stream
-        return CodeExecutorAgent(
-            name=agent_cfg.name,
-            code_executor=code_executor,
-            model_client=model_client,
-            system_message=agent_cfg.system_message,
-            description=agent_cfg.description,
-            sources=agent_cfg.sources,
-            model_client_stream=agent_cfg.model_client_stream
-        )
-
-    # Looping assistant agent
-    if agent_cfg.agent_type == 'looping':
-        return LoopingAssistantAgent(
-            name=agent_cfg.name,
-            description=agent_cfg.description,
-            system_message=agent_cfg.prompt.system,
-            model_client=model_client,
-            tools=agent_tools,
-            reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
-            max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
-        )
-
-    # Looping code executor agent
-    if agent_cfg.agent_type == 'looping_code_executor':
-        ce_cfg = agent_cfg.code_executor or {}
-        ce_type = ce_cfg.get('type')
-        if ce_type == 'local':
-            work_dir = ce_cfg.get('work_dir') or os.getcwd()
-            code_executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
-        else:
-            raise ValueError(f"Unsupported code_executor type: {ce_type}")
-        return LoopingCodeExecutorAgent(
-            name=agent_cfg.name,
-            code_executor=code_executor,
-            model_client=model_client,
-            system_message=agent_cfg.system_message,
-            description=agent_cfg.description,
-            sources=agent_cfg.sources,
-            model_client_stream=agent_cfg.model_client_stream,
-            max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
-        )
-
-    # Multimodal tools looping agent
-    if agent_cfg.agent_type == 'multimodal_tools_looping':
-        return MultimodalToolsLoopingAgent(
-            name=agent_cfg.name,
-            description=agent_cfg.description,
-            system_message=agent_cfg.prompt.system,
-            model_client=model_client,
-            tools=agent_tools,
-            reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
-            max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply
-        )
-
-    # Dynamic initialization looping agent
-    if agent_cfg.agent_type == 'dynamic_init_looping':
-        return DynamicInitLoopingAgent(
-            name=agent_cfg.name,
-            description=agent_cfg.description,
-            system_message=agent_cfg.prompt.system,
-            model_client=model_client,
-            tools=agent_tools,
-            reflect_on_tool_use=agent_cfg.reflect_on_tool_use,
-            max_consecutive_auto_reply=agent_cfg.max_consecutive_auto_reply,
-            initialization_function=agent_cfg.initialization_function
-        )
-
-    # Custom loop agent with output handler
-    if agent_cfg.agent_type == 'custom_loop':
-        return CustomLoopAgent(
-            name=agent_cfg.name,
-            description=agent_cfg.description,
-            system_message=agent_cfg.prompt.system,
-            model_client=model_client,
-            tools=agent_tools,
-            output_handler=agent_cfg.output_handler,
-            output_handler_config=agent_cfg.output_handler_config or {},
-            max_iterations=agent_cfg.max_consecutive_auto_reply
-        )
-
-    # Default: standard AssistantAgent
-    return AssistantAgent(
-        name=agent_cfg.name,
-        description=agent_cfg.description,
-        system_message=agent_cfg.prompt.system,
-        model_client=model_client,
-        tools=agent_tools,
-    )
+    builder = _BUILDERS.get(agent_cfg.agent_type, _build_assistant)
+    return builder(agent_cfg, agent_tools, all_tools, model_client)
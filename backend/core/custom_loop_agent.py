@@ -13,6 +13,7 @@ This is useful for:
 """
 
 import asyncio
+import functools
 import logging
 from pathlib import Path
 from typing import AsyncIterator, Callable, Dict, List, Optional, Any
@@ -35,6 +36,15 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_ITERATIONS = 5
 
 
+# Decoded screenshots can be several MB each, and a rewritten file leaves its
+# old entry behind until evicted, so keep only the last few images
+@functools.lru_cache(maxsize=8)
+def _load_agimage_cached(path: str, mtime_ns: int, size: int) -> AGImage:
+    """Decode an image file once per (path, mtime, size), so feedback loops
+    that resend an unchanged image don't re-read and re-decode it."""
+    return AGImage.from_file(Path(path))
+
+
 class CustomLoopAgent(AssistantAgent):
     """
     An agent that processes its output through a custom handler each iteration.
@@ -77,6 +87,11 @@ class CustomLoopAgent(AssistantAgent):
         self.output_handler_path = output_handler
         self.output_handler_config = output_handler_config or {}
         self.max_iterations = max_iterations if max_iterations is not None else DEFAULT_MAX_ITERATIONS
+        # Context passed to the handler; fixed for the agent's lifetime
+        self._handler_context_base = {
+            "agent_name": self.name,
+            "output_dir": self.output_handler_config.get("output_dir", "data/workspace/html_outputs"),
+        }
 
         # Load the handler function
         self._handler_func: Optional[Callable] = None
@@ -92,16 +107,17 @@ class CustomLoopAgent(AssistantAgent):
         """Load an image file as an AGImage object for multimodal input."""
         try:
             path = Path(image_path)
-            if path.exists():
-                return AGImage.from_file(path)
-            else:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
                 logger.warning(f"Image file not found: {image_path}")
                 return None
+            return _load_agimage_cached(str(path), st.st_mtime_ns, st.st_size)
         except Exception as e:
             logger.warning(f"Failed to load image {image_path}: {e}")
             return None
 
-    def _create_feedback_message(
+    async def _create_feedback_message(
         self,
         result: OutputHandlerResult,
         source: str = "system"
@@ -112,12 +128,12 @@ class CustomLoopAgent(AssistantAgent):
         If images are present, creates a MultiModalMessage.
         Otherwise, creates a TextMessage.
         """
-        # Load images
-        images = []
-        for img_path in result.feedback_images:
-            img = self._load_image_as_agimage(img_path)
-            if img:
-                images.append(img)
+        # Load images off the event loop, concurrently, keeping their order
+        loaded = await asyncio.gather(*(
+            asyncio.to_thread(self._load_image_as_agimage, img_path)
+            for img_path in result.feedback_images
+        ))
+        images = [img for img in loaded if img]
 
         feedback_text = result.feedback_text or ""
 
@@ -141,7 +157,7 @@ class CustomLoopAgent(AssistantAgent):
         1. Get model output
         2. Pass output to handler
         3. If handler says stop -> break
-        4. Else -> add feedback to history and continue
+        4. Else -> send feedback as the next turn and continue
         """
         if cancellation_token is None:
             cancellation_token = CancellationToken()
@@ -153,15 +169,18 @@ class CustomLoopAgent(AssistantAgent):
             ).model_dump()
             return
 
-        # Initialize history with the user task
-        history: List[BaseChatMessage] = [TextMessage(content=task, source="user")]
+        # Messages for the next model turn. The base agent keeps the running
+        # conversation (including its own replies) in its model context, so
+        # each turn only passes what is new rather than the whole history.
+        pending: List[BaseChatMessage] = [TextMessage(content=task, source="user")]
         iteration = 0
 
-        # Context passed to handler
-        handler_context = {
-            "agent_name": self.name,
-            "output_dir": self.output_handler_config.get("output_dir", "data/workspace/html_outputs"),
-        }
+        # Context passed to handler (a per-run copy, in case a handler stores state in it)
+        handler_context = dict(self._handler_context_base)
+
+        # Bound once for the per-event loop below
+        stream_messages = super().on_messages_stream
+        chunk_type, response_type = ModelClientStreamingChunkEvent, Response
 
         while True:
             iteration += 1
@@ -175,48 +194,48 @@ class CustomLoopAgent(AssistantAgent):
 
             logger.info(f"[{self.name}] Iteration {iteration}/{self.max_iterations}")
 
-            # Collect the model's complete output this iteration
-            accumulated_output = ""
-            current_iteration_messages: List[BaseChatMessage] = []
+            # Collect the model's complete output this iteration. Chunks are
+            # joined once at the end rather than concatenated per token.
+            chunks: List[str] = []
+            response_output: Optional[str] = None
 
             try:
-                async for evt in super().on_messages_stream(
-                    messages=history,
+                async for evt in stream_messages(
+                    messages=pending,
                     cancellation_token=cancellation_token
                 ):
-                    # Yield streaming events to frontend
-                    if isinstance(evt, ModelClientStreamingChunkEvent):
+                    # Yield streaming events to frontend. Chunks are by far the
+                    # most frequent event, so they are tested first.
+                    if isinstance(evt, chunk_type):
                         if evt.content:
-                            accumulated_output += evt.content
+                            chunks.append(evt.content)
                         yield evt.model_dump()
 
-                    elif isinstance(evt, Response):
+                    elif isinstance(evt, response_type):
                         if evt.chat_message:
                             # Capture the final response content
                             # Use the final message content, which may be more complete than streaming chunks
                             msg_content = evt.chat_message.content
-                            if msg_content:
+                            if msg_content and response_output is None:
                                 # Handle both string and list content (for multimodal)
                                 if isinstance(msg_content, str):
-                                    # Only use Response content if we didn't accumulate via streaming
-                                    if not accumulated_output.strip():
-                                        accumulated_output = msg_content
+                                    response_output = msg_content
                                 elif isinstance(msg_content, list):
                                     # Extract text from multimodal content list
-                                    text_parts = [str(item) for item in msg_content if isinstance(item, str)]
-                                    if text_parts and not accumulated_output.strip():
-                                        accumulated_output = "\n".join(text_parts)
-                            current_iteration_messages.append(evt.chat_message)
+                                    response_output = "\n".join(item for item in msg_content if isinstance(item, str))
                             yield evt.chat_message.model_dump()
                         else:
                             yield evt.model_dump() if hasattr(evt, 'model_dump') else {}
 
-                    elif isinstance(evt, (TextMessage, MultiModalMessage)):
-                        yield evt.model_dump()
-
                     else:
+                        # Text/multimodal messages and any other event
                         yield evt.model_dump() if hasattr(evt, 'model_dump') else evt.__dict__
 
+                # Only use Response content if we didn't accumulate via streaming
+                accumulated_output = "".join(chunks)
+                if response_output is not None and not accumulated_output.strip():
+                    accumulated_output = response_output
+
                 logger.info(f"[{self.name}] Iteration {iteration} output length: {len(accumulated_output)}")
 
             except asyncio.CancelledError:
@@ -226,8 +245,8 @@ class CustomLoopAgent(AssistantAgent):
                 ).model_dump()
                 raise
 
-            # Add assistant messages to history
-            history.extend(current_iteration_messages)
+            # The model context now holds these messages and the reply
+            pending = []
 
             # Process output through handler
             if not accumulated_output.strip():
@@ -237,14 +256,16 @@ class CustomLoopAgent(AssistantAgent):
                     content="Your output was empty. Please provide the requested output.",
                     source="system"
                 )
-                history.append(feedback_msg)
+                pending.append(feedback_msg)
                 yield feedback_msg.model_dump()
-                await asyncio.sleep(0.1)
                 continue
 
             try:
                 logger.info(f"[{self.name}] Processing output through handler...")
-                handler_result = self._handler_func(
+                # Handlers do blocking work (file writes, screenshots via
+                # subprocess), so run them off the event loop
+                handler_result = await asyncio.to_thread(
+                    self._handler_func,
                     output=accumulated_output,
                     iteration=iteration,
                     config=self.output_handler_config,
@@ -268,18 +289,16 @@ class CustomLoopAgent(AssistantAgent):
                     ).model_dump()
                 break
 
-            # Create feedback message and add to history
+            # Create feedback message and send it as the next turn
             if handler_result.feedback_text or handler_result.feedback_images:
-                feedback_msg = self._create_feedback_message(handler_result, source="system")
-                history.append(feedback_msg)
+                feedback_msg = await self._create_feedback_message(handler_result, source="system")
+                pending.append(feedback_msg)
                 yield feedback_msg.model_dump()
 
             # Log saved file info
             if handler_result.saved_file:
                 logger.info(f"[{self.name}] Saved: {handler_result.saved_file}")
 
-            await asyncio.sleep(0.1)
-
         logger.info(f"[{self.name}] Completed after {iteration} iteration(s)")
 
     async def on_messages_stream(
@@ -300,14 +319,16 @@ class CustomLoopAgent(AssistantAgent):
                 yield evt
             return
 
-        # Context passed to handler
-        handler_context = {
-            "agent_name": self.name,
-            "output_dir": self.output_handler_config.get("output_dir", "data/workspace/html_outputs"),
-        }
+        # Context passed to handler (a per-run copy, in case a handler stores state in it)
+        handler_context = dict(self._handler_context_base)
 
-        # Start with the incoming messages as history
-        history: List[BaseChatMessage] = list(messages)
+        # Bound once for the per-event loop below
+        stream_messages = super().on_messages_stream
+        chunk_type, response_type = ModelClientStreamingChunkEvent, Response
+
+        # Messages for the next model turn; earlier turns already live in the
+        # base agent's model context, so only new messages are passed along
+        pending: List[BaseChatMessage] = list(messages)
         iteration = 0
         final_response: Optional[Response] = None
 
@@ -320,50 +341,49 @@ class CustomLoopAgent(AssistantAgent):
 
             logger.info(f"[{self.name}] on_messages_stream iteration {iteration}/{self.max_iterations}")
 
-            # Collect the model's complete output this iteration
-            accumulated_output = ""
-            current_iteration_messages: List[BaseChatMessage] = []
+            # Collect the model's complete output this iteration. Chunks are
+            # joined once at the end rather than concatenated per token.
+            chunks: List[str] = []
+            response_output: Optional[str] = None
 
             try:
-                async for evt in super().on_messages_stream(
-                    messages=history,
+                async for evt in stream_messages(
+                    messages=pending,
                     cancellation_token=cancellation_token
                 ):
                     # Capture streaming content
-                    if isinstance(evt, ModelClientStreamingChunkEvent):
+                    if isinstance(evt, chunk_type):
                         if evt.content:
-                            accumulated_output += evt.content
+                            chunks.append(evt.content)
                         yield evt
 
-                    elif isinstance(evt, Response):
+                    elif isinstance(evt, response_type):
                         if evt.chat_message:
                             # Capture final response content
                             msg_content = evt.chat_message.content
-                            if msg_content:
+                            if msg_content and response_output is None:
                                 if isinstance(msg_content, str):
-                                    if not accumulated_output.strip():
-                                        accumulated_output = msg_content
+                                    response_output = msg_content
                                 elif isinstance(msg_content, list):
-                                    text_parts = [str(item) for item in msg_content if isinstance(item, str)]
-                                    if text_parts and not accumulated_output.strip():
-                                        accumulated_output = "\n".join(text_parts)
-                            current_iteration_messages.append(evt.chat_message)
+                                    response_output = "\n".join(item for item in msg_content if isinstance(item, str))
                             final_response = evt
                             # Don't yield the Response yet - we may continue looping
                         else:
                             yield evt
 
-                    elif isinstance(evt, (TextMessage, MultiModalMessage)):
-                        yield evt
-
                     else:
                         yield evt
 
+                # Only use Response content if we didn't accumulate via streaming
+                accumulated_output = "".join(chunks)
+                if response_output is not None and not accumulated_output.strip():
+                    accumulated_output = response_output
+
             except asyncio.CancelledError:
                 raise
 
-            # Add assistant messages to history for potential next iteration
-            history.extend(current_iteration_messages)
+            # The model context now holds these messages and the reply
+            pending = []
 
             # If no output, give model another chance
             if not accumulated_output.strip():
@@ -372,15 +392,17 @@ class CustomLoopAgent(AssistantAgent):
                     content="Your output was empty. Please provide the requested output.",
                     source="system"
                 )
-                history.append(feedback_msg)
+                pending.append(feedback_msg)
                 yield feedback_msg
-                await asyncio.sleep(0.1)
                 continue
 
             # Process output through handler
             try:
                 logger.info(f"[{self.name}] Processing through handler at iteration {iteration}")
-                handler_result = self._handler_func(
+                # Handlers do blocking work (file writes, screenshots via
+                # subprocess), so run them off the event loop
+                handler_result = await asyncio.to_thread(
+                    self._handler_func,
                     output=accumulated_output,
                     iteration=iteration,
                     config=self.output_handler_config,
@@ -401,18 +423,16 @@ class CustomLoopAgent(AssistantAgent):
                     yield final_response
                 break
 
-            # Continue with feedback - add to history for next iteration
+            # Continue with feedback - send it as the next turn
             if handler_result.feedback_text or handler_result.feedback_images:
-                feedback_msg = self._create_feedback_message(handler_result, source="system")
-                history.append(feedback_msg)
+                feedback_msg = await self._create_feedback_message(handler_result, source="system")
+                pending.append(feedback_msg)
                 yield feedback_msg
 
             # Log saved file info
             if handler_result.saved_file:
                 logger.info(f"[{self.name}] Saved: {handler_result.saved_file}")
 
-            await asyncio.sleep(0.1)
-
         # If we exited the loop without yielding a response, yield it now
         if final_response:
             yield final_response
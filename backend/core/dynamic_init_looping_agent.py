@@ -9,7 +9,7 @@ setup logic before the agent starts processing tasks.
 
 import logging
 import importlib
-from typing import Optional
+from typing import Callable, Dict, Optional
 from core.looping_agent import LoopingAssistantAgent
 
 logger = logging.getLogger(__name__)
@@ -49,6 +49,9 @@ class DynamicInitLoopingAgent(LoopingAssistantAgent):
         *args, **kwargs: Additional arguments passed to LoopingAssistantAgent
     """
 
+    # 'module.function_name' -> resolved function, shared by every instance
+    _init_func_cache: Dict[str, Callable] = {}
+
     def __init__(self, *args, initialization_function: Optional[str] = None, **kwargs):
         """
         Initialize the agent and run the custom initialization function if provided.
@@ -85,11 +88,40 @@ class DynamicInitLoopingAgent(LoopingAssistantAgent):
         if not self.initialization_function:
             return
 
+        init_func = self._resolve_initialization_function(self.initialization_function)
+
+        # Call the function with self (the agent instance) as argument
+        try:
+            result = init_func(self)
+            if result:
+                logger.info(f"Initialization function returned: {result}")
+        except Exception as e:
+            raise Exception(
+                f"Error executing initialization function '{self.initialization_function}': {e}"
+            )
+
+    @classmethod
+    def _resolve_initialization_function(cls, initialization_function: str) -> Callable:
+        """
+        Import and return the function named by 'module.function_name'.
+
+        Resolved functions are cached on the class, so agents created per
+        session don't repeat the import and lookup.
+
+        Raises:
+            ValueError: If the function string is invalid or missing parts
+            ImportError: If the module cannot be imported
+            AttributeError: If the function doesn't exist in the module
+        """
+        init_func = cls._init_func_cache.get(initialization_function)
+        if init_func is not None:
+            return init_func
+
         # Parse the function string (format: 'module.function_name')
-        parts = self.initialization_function.split('.')
+        parts = initialization_function.split('.')
         if len(parts) < 2:
             raise ValueError(
-                f"Invalid initialization_function format: '{self.initialization_function}'. "
+                f"Invalid initialization_function format: '{initialization_function}'. "
                 f"Expected format: 'module.function_name' (e.g., 'memory.initialize_memory_agent')"
             )
 
@@ -99,7 +131,7 @@ class DynamicInitLoopingAgent(LoopingAssistantAgent):
         # Import the module from tools package
         try:
             module = importlib.import_module(f'tools.{module_name}')
-            logger.debug(f"Successfully imported module: tools.{module_name}")
+            logger.debug("Successfully imported module: tools.%s", module_name)
         except ImportError as e:
             raise ImportError(
                 f"Failed to import module 'tools.{module_name}' for initialization function. "
@@ -109,19 +141,12 @@ class DynamicInitLoopingAgent(LoopingAssistantAgent):
         # Get the function from the module
         try:
             init_func = getattr(module, function_name)
-            logger.debug(f"Successfully found function: {function_name}")
+            logger.debug("Successfully found function: %s", function_name)
         except AttributeError:
             raise AttributeError(
                 f"Function '{function_name}' not found in module 'tools.{module_name}'. "
                 f"Available functions: {[name for name in dir(module) if not name.startswith('_')]}"
             )
 
-        # Call the function with self (the agent instance) as argument
-        try:
-            result = init_func(self)
-            if result:
-                logger.info(f"Initialization function returned: {result}")
-        except Exception as e:
-            raise Exception(
-                f"Error executing initialization function '{self.initialization_function}': {e}"
-            )
+        cls._init_func_cache[initialization_function] = init_func
+        return init_func
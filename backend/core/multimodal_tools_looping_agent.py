@@ -57,15 +57,25 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
         re.IGNORECASE
     )
 
-    # Pattern to detect file paths in tool responses
+    # Pattern to detect file paths in tool responses. Matches may only start
+    # right after a delimiter (or at the start of the text), checked with a
+    # lookbehind so the delimiter is not consumed; path segments cannot
+    # contain '/', so each path splits into segments exactly one way.
     FILE_PATH_PATTERN = re.compile(
-        r'(?:^|[\s\'\"\(\)\[\]\{\}:,])((?:[\/~])?(?:[\w\-\.]+\/)*[\w\-\.]+\.(?:png|jpg|jpeg|gif|bmp|webp))(?=[\s\'\"\)\]\}\.:,]|$)',
+        r'(?<![^\s\'\"\(\)\[\]\{\}<`:,])(?=[~\.\/\w\-])'
+        r'((?:~|\.{1,2})?\/?(?:[\w\-\.]+\/)*[\w\-\.]+\.(?:png|jpe?g|gif|bmp|webp))'
+        r'(?=[\s\'\"\)\]\}>`\.:,;]|$)',
         re.IGNORECASE | re.MULTILINE
     )
 
     # Pattern to detect TERMINATE keyword (case-insensitive, word boundary)
     TERMINATE_PATTERN = re.compile(r'\bTERMINATE\b', re.IGNORECASE)
 
+    # Streamed text chunks are merged and yielded once this many characters
+    # are pending, or once the oldest pending chunk is this many seconds old
+    STREAM_FLUSH_CHARS = 64
+    STREAM_FLUSH_INTERVAL = 0.05
+
     def __init__(
         self,
         *args,
@@ -95,6 +105,8 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
         # Pass system_message to parent
         super().__init__(*args, system_message=system_message, **kwargs)
         self.max_consecutive_auto_reply = max_consecutive_auto_reply if max_consecutive_auto_reply is not None else DEFAULT_MAX_ITERS
+        # Candidate path string -> resolved image Path, or None if missing (reset per run_stream)
+        self._path_exist_cache: dict[str, Path | None] = {}
 
         if PILImage is None:
             logger.warning("PIL (Pillow) not installed. Image handling will be limited.")
@@ -125,15 +137,25 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
         """
         images = []
 
+        # Every match contains one of these substrings (case-insensitively), so
+        # most tool results are ruled out with substring checks before any regex runs
+        lowered = content.lower()
+        has_base64 = 'data:image/' in lowered
+        has_extension = any(ext in lowered for ext in self.IMAGE_EXTENSIONS)
+
         # 1. Check for base64 encoded images
-        base64_matches = self.BASE64_IMAGE_PATTERN.findall(content)
-        for format_type, b64_data in base64_matches:
-            try:
-                image = AGImage.from_base64(b64_data)
-                images.append(image)
-                logger.info(f"Detected base64 image (format: {format_type})")
-            except Exception as e:
-                logger.warning(f"Failed to parse base64 image: {e}")
+        if has_base64:
+            base64_matches = self.BASE64_IMAGE_PATTERN.findall(content)
+            for format_type, b64_data in base64_matches:
+                try:
+                    image = AGImage.from_base64(b64_data)
+                    images.append(image)
+                    logger.info(f"Detected base64 image (format: {format_type})")
+                except Exception as e:
+                    logger.warning(f"Failed to parse base64 image: {e}")
+
+        if not has_extension:
+            return images
 
         # 2. Check for file paths
         file_matches = set(self.FILE_PATH_PATTERN.findall(content))
@@ -147,10 +169,17 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
                 if any(lower.endswith(ext) for ext in self.IMAGE_EXTENSIONS):
                     file_matches.add(cleaned)
 
+        path_cache = self._path_exist_cache
         for file_path_str in file_matches:
             try:
-                file_path = Path(file_path_str).expanduser().resolve()
-                if file_path.exists() and file_path.suffix.lower() in self.IMAGE_EXTENSIONS:
+                if file_path_str in path_cache:
+                    file_path = path_cache[file_path_str]
+                else:
+                    file_path = Path(file_path_str).expanduser().resolve()
+                    if not (file_path.suffix.lower() in self.IMAGE_EXTENSIONS and file_path.exists()):
+                        file_path = None
+                    path_cache[file_path_str] = file_path
+                if file_path is not None:
                     image = AGImage.from_file(file_path)
                     images.append(image)
                     logger.info(f"Detected image file: {file_path}")
@@ -185,6 +214,13 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
             # No images detected, return regular text message
             return TextMessage(content=tool_result_content, source=source)
 
+    @staticmethod
+    def _merge_chunk_events(last_chunk: ModelClientStreamingChunkEvent, parts: List[str]) -> dict:
+        """Dump the last pending chunk event with the text of all pending chunks as its content."""
+        payload = last_chunk.model_dump()
+        payload["content"] = "".join(parts)
+        return payload
+
     def _message_contains_terminate(self, message: BaseChatMessage) -> bool:
         """Check whether a chat message contains the TERMINATE keyword."""
         content = getattr(message, "content", None)
@@ -217,95 +253,133 @@ class MultimodalToolsLoopingAgent(AssistantAgent):
         # Initialize history with the initial user task
         history: List[BaseChatMessage] = [TextMessage(content=task, source="user")]
         iters = 0
-
-        while True:
-            iters += 1
-            if iters > self.max_consecutive_auto_reply:
-                yield TextMessage(
-                    content=f"[SYSTEM] Safety stop: max iterations ({self.max_consecutive_auto_reply}) reached.",
-                    source="system"
-                ).model_dump()
-                break
-
-            last_assistant_text_message_content: str | None = None
-            accumulated_assistant_chunks: str = ""
-            current_iteration_new_history: List[BaseChatMessage] = []
-            terminate_detected_this_iteration = False
-
-            try:
-                async for evt in super().on_messages_stream(messages=history, cancellation_token=cancellation_token):
-                    # Convert event to proper JSON format before yielding
-                    if isinstance(evt, (TextMessage, MultiModalMessage, ModelClientStreamingChunkEvent, ToolCallExecutionEvent)):
-                        yield evt.model_dump()
-                    elif isinstance(evt, Response):
-                        if evt.chat_message and evt.chat_message.source == self.name:
-                            if evt.chat_message.content:
-                                last_assistant_text_message_content = evt.chat_message.content
-                                current_iteration_new_history.append(evt.chat_message)
-                                if self._message_contains_terminate(evt.chat_message):
-                                    terminate_detected_this_iteration = True
-                                accumulated_assistant_chunks = ""
-                        yield evt.chat_message.model_dump() if evt.chat_message else evt.model_dump()
-                    else:
-                        # For any other event types, try model_dump() or convert to dict
-                        yield evt.model_dump() if hasattr(evt, 'model_dump') else evt.__dict__
-
-                    # Handle tool call execution - THIS IS WHERE MULTIMODAL MAGIC HAPPENS
-                    if isinstance(evt, ToolCallExecutionEvent):
-                        for result in evt.content:
-                            result_content = str(result.content)
-
-                            # Create multimodal message if images detected, otherwise text message
-                            msg = self._create_multimodal_message_from_tool_result(
-                                result_content,
-                                source="tools"
-                            )
-
-                            current_iteration_new_history.append(msg)
-
-                            if self._message_contains_terminate(msg):
-                                terminate_detected_this_iteration = True
-
-                            # Yield the multimodal message so frontend can see it
-                            yield msg.model_dump()
-
-                        accumulated_assistant_chunks = ""
-                        last_assistant_text_message_content = None
-                    elif isinstance(evt, ModelClientStreamingChunkEvent):
-                        if evt.content:
+        self._path_exist_cache = {}
+        loop_time = asyncio.get_running_loop().time
+
+        try:
+            while True:
+                iters += 1
+                if iters > self.max_consecutive_auto_reply:
+                    yield TextMessage(
+                        content=f"[SYSTEM] Safety stop: max iterations ({self.max_consecutive_auto_reply}) reached.",
+                        source="system"
+                    ).model_dump()
+                    break
+
+                last_assistant_text_message_content: str | None = None
+                accumulated_assistant_chunks: str = ""
+                current_iteration_new_history: List[BaseChatMessage] = []
+                terminate_detected_this_iteration = False
+                pending_chunks: List[str] = []
+                pending_chars = 0
+                pending_since = 0.0
+                last_chunk: ModelClientStreamingChunkEvent | None = None
+
+                try:
+                    async for evt in super().on_messages_stream(messages=history, cancellation_token=cancellation_token):
+                        if isinstance(evt, ModelClientStreamingChunkEvent) and evt.content:
+                            if not pending_chunks:
+                                pending_since = loop_time()
+                            pending_chunks.append(evt.content)
+                            pending_chars += len(evt.content)
+                            last_chunk = evt
                             accumulated_assistant_chunks += evt.content
                             if self.TERMINATE_PATTERN.search(accumulated_assistant_chunks):
                                 terminate_detected_this_iteration = True
+                            if (
+                                terminate_detected_this_iteration
+                                or pending_chars >= self.STREAM_FLUSH_CHARS
+                                or loop_time() - pending_since >= self.STREAM_FLUSH_INTERVAL
+                            ):
+                                chunk_payload = self._merge_chunk_events(last_chunk, pending_chunks)
+                                pending_chunks.clear()
+                                pending_chars = 0
+                                yield chunk_payload
+                            if terminate_detected_this_iteration:
+                                break
+                            continue
+
+                        # Any other event goes out after the text streamed before it
+                        if pending_chunks:
+                            chunk_payload = self._merge_chunk_events(last_chunk, pending_chunks)
+                            pending_chunks.clear()
+                            pending_chars = 0
+                            yield chunk_payload
+
+                        # Convert event to proper JSON format before yielding
+                        if isinstance(evt, (TextMessage, MultiModalMessage, ModelClientStreamingChunkEvent, ToolCallExecutionEvent)):
+                            yield evt.model_dump()
+                        elif isinstance(evt, Response):
+                            if evt.chat_message and evt.chat_message.source == self.name:
+                                if evt.chat_message.content:
+                                    last_assistant_text_message_content = evt.chat_message.content
+                                    current_iteration_new_history.append(evt.chat_message)
+                                    if self._message_contains_terminate(evt.chat_message):
+                                        terminate_detected_this_iteration = True
+                                    accumulated_assistant_chunks = ""
+                            yield evt.chat_message.model_dump() if evt.chat_message else evt.model_dump()
+                        else:
+                            # For any other event types, try model_dump() or convert to dict
+                            yield evt.model_dump() if hasattr(evt, 'model_dump') else evt.__dict__
+
+                        # Handle tool call execution - THIS IS WHERE MULTIMODAL MAGIC HAPPENS
+                        if isinstance(evt, ToolCallExecutionEvent):
+                            for result in evt.content:
+                                result_content = str(result.content)
+
+                                # Create multimodal message if images detected, otherwise text message
+                                msg = self._create_multimodal_message_from_tool_result(
+                                    result_content,
+                                    source="tools"
+                                )
+
+                                current_iteration_new_history.append(msg)
+
+                                if self._message_contains_terminate(msg):
+                                    terminate_detected_this_iteration = True
 
-                    if terminate_detected_this_iteration:
-                        break
+                                # Yield the multimodal message so frontend can see it
+                                yield msg.model_dump()
 
-            except asyncio.CancelledError:
-                yield TextMessage(content="[SYSTEM] Operation cancelled.", source="system").model_dump()
-                raise
+                            accumulated_assistant_chunks = ""
+                            last_assistant_text_message_content = None
 
-            final_content_this_iteration = (
-                last_assistant_text_message_content
-                if last_assistant_text_message_content is not None
-                else accumulated_assistant_chunks
-            )
+                        if terminate_detected_this_iteration:
+                            break
 
-            if accumulated_assistant_chunks and last_assistant_text_message_content is None:
-                chunk_message = TextMessage(content=accumulated_assistant_chunks, source=self.name)
-                if not current_iteration_new_history or current_iteration_new_history[-1] != chunk_message:
-                    current_iteration_new_history.append(chunk_message)
-                    if self._message_contains_terminate(chunk_message):
-                        terminate_detected_this_iteration = True
+                    if pending_chunks:
+                        chunk_payload = self._merge_chunk_events(last_chunk, pending_chunks)
+                        pending_chunks.clear()
+                        yield chunk_payload
 
-            history.extend(current_iteration_new_history)
+                except asyncio.CancelledError:
+                    if pending_chunks:
+                        yield self._merge_chunk_events(last_chunk, pending_chunks)
+                    yield TextMessage(content="[SYSTEM] Operation cancelled.", source="system").model_dump()
+                    raise
 
-            if (
-                terminate_detected_this_iteration
-                or (
-                    final_content_this_iteration
-                    and self.TERMINATE_PATTERN.search(final_content_this_iteration)
+                final_content_this_iteration = (
+                    last_assistant_text_message_content
+                    if last_assistant_text_message_content is not None
+                    else accumulated_assistant_chunks
                 )
-            ):
-                break
 
-            await asyncio.sleep(0.1)
+                if accumulated_assistant_chunks and last_assistant_text_message_content is None:
+                    chunk_message = TextMessage(content=accumulated_assistant_chunks, source=self.name)
+                    if not current_iteration_new_history or current_iteration_new_history[-1] != chunk_message:
+                        current_iteration_new_history.append(chunk_message)
+                        if self._message_contains_terminate(chunk_message):
+                            terminate_detected_this_iteration = True
+
+                history.extend(current_iteration_new_history)
+
+                if (
+                    terminate_detected_this_iteration
+                    or (
+                        final_content_this_iteration
+                        and self.TERMINATE_PATTERN.search(final_content_this_iteration)
+                    )
+                ):
+                    break
+        finally:
+            self._path_exist_cache.clear()
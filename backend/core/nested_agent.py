@@ -18,6 +18,7 @@ import re  # ensure regex available
 # Track current team agent names and orchestrator for selector validation
 _TEAM_AGENT_NAMES: set[str] = set()
 _ORCHESTRATOR_NAME: str = "Manager"
+_ORCHESTRATOR_NAME_LOWER: str = _ORCHESTRATOR_NAME.lower()
 _ORCHESTRATOR_PATTERN: str = "NEXT AGENT: <Name>"
 
 # Build orchestrator-only termination condition (case-insensitive 'terminate')
@@ -71,6 +72,9 @@ def _create_pattern_regex(pattern: str) -> str:
     regex_pattern = escaped_pattern.replace(r'\<Name\>', r'([A-Za-z0-9_ \-]+)')
     return regex_pattern
 
+# Compiled _ORCHESTRATOR_PATTERN, rebuilt with it in _init_team so the selector doesn't recompile per message
+_ORCHESTRATOR_PATTERN_RE: re.Pattern = re.compile(_create_pattern_regex(_ORCHESTRATOR_PATTERN), re.IGNORECASE)
+
 def _custom_agent_selector(messages):
     """Deterministic custom selector with safeguards.
     Orchestrator-only termination: Other agents saying TERMINATE just hands control back to orchestrator.
@@ -94,11 +98,10 @@ def _custom_agent_selector(messages):
         if "TERMINATE" in content:
             return None  # termination condition will catch TERMINATE token in stream
         # Parse agent selection pattern (case-insensitive)
-        pattern_regex = _create_pattern_regex(_ORCHESTRATOR_PATTERN)
-        match = re.search(pattern_regex, content, re.IGNORECASE)
+        match = _ORCHESTRATOR_PATTERN_RE.search(content)
         if match:
             agent_name = match.group(1).strip().rstrip('.')
-            if agent_name and agent_name.lower() != _ORCHESTRATOR_NAME.lower() and agent_name in _TEAM_AGENT_NAMES:
+            if agent_name and agent_name in _TEAM_AGENT_NAMES and agent_name.lower() != _ORCHESTRATOR_NAME_LOWER:
                 return agent_name
         return None
 
@@ -160,10 +163,13 @@ class NestedTeamAgent(BaseChatAgent):
             for sub_cfg in (self.agent_cfg.sub_agents or [])
         ]
         # Update global variables for orchestrator and team agent names
-        global _TEAM_AGENT_NAMES, _ORCHESTRATOR_NAME, _ORCHESTRATOR_PATTERN
+        global _TEAM_AGENT_NAMES, _ORCHESTRATOR_NAME, _ORCHESTRATOR_NAME_LOWER
+        global _ORCHESTRATOR_PATTERN, _ORCHESTRATOR_PATTERN_RE
         _TEAM_AGENT_NAMES = {a.name for a in sub_agents}
         _ORCHESTRATOR_NAME = self.agent_cfg.orchestrator_agent_name or "Manager"
+        _ORCHESTRATOR_NAME_LOWER = _ORCHESTRATOR_NAME.lower()
         _ORCHESTRATOR_PATTERN = self.agent_cfg.orchestrator_pattern or "NEXT AGENT: <Name>"
+        _ORCHESTRATOR_PATTERN_RE = re.compile(_create_pattern_regex(_ORCHESTRATOR_PATTERN), re.IGNORECASE)
 
         # Build agent descriptions for orchestrator (inject into {{AVAILABLE_AGENTS}} placeholder)
         self._inject_agent_descriptions(sub_agents)
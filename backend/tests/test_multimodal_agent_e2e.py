@@ -101,6 +101,26 @@ def test_detect_file_path_in_text():
         assert len(matches) == expected_count, f"Failed for: {text}"
 
 
+def test_detect_file_path_anchoring():
+    """Test that file paths only match after a delimiter and keep their prefix."""
+    agent = MultimodalToolsLoopingAgent(
+        name="TestAgent",
+        model_client=MockModelClient(),
+        tools=[]
+    )
+
+    test_cases = [
+        ("Saved to ~/shots/a.png.", ["~/shots/a.png"]),
+        ("Files: a.png,b.gif", ["a.png", "b.gif"]),
+        ("See `../out/plot.webp`", ["../out/plot.webp"]),
+        ("url https://example.com/img/a.png", []),
+        ("x=a.png", []),
+    ]
+
+    for text, expected in test_cases:
+        assert agent.FILE_PATH_PATTERN.findall(text) == expected, f"Failed for: {text}"
+
+
 def test_detect_base64_image_in_text():
     """Test that the agent can detect base64 encoded images."""
     agent = MultimodalToolsLoopingAgent(
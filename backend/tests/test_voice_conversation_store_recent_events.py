@@ -0,0 +1,160 @@
+"""
+Test the in-memory recent events buffer of the voice conversation store.
+"""
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.voice_conversation_store import ConversationStore
+
+
+def _make_store(tmp_path, maxlen=5):
+    store = ConversationStore(db_path=str(tmp_path / "conversations.db"))
+    store.RECENT_EVENTS_MAXLEN = maxlen
+    return store
+
+
+def test_recent_events_returns_latest_events_oldest_first(tmp_path):
+    """The buffer holds the newest events, in insertion order"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    for i in range(8):
+        store.append_event(conversation_id, {"n": i}, source="user", event_type="test")
+
+    events = store.recent_events(conversation_id)
+    assert [e["payload"]["n"] for e in events] == [3, 4, 5, 6, 7]
+    assert store.recent_events(conversation_id, limit=2) == events[-2:]
+
+
+def test_recent_events_tracks_appends_after_load(tmp_path):
+    """Appends after the buffer is loaded are reflected without a reload"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    store.append_event(conversation_id, {"n": 0})
+    assert len(store.recent_events(conversation_id)) == 1
+
+    store.append_event(conversation_id, {"n": 1})
+    events = store.recent_events(conversation_id)
+    assert [e["payload"]["n"] for e in events] == [0, 1]
+    assert events == store.list_events(conversation_id)
+
+
+def test_recent_events_cleared_on_delete(tmp_path):
+    """Deleting a conversation drops its buffered events"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    store.append_event(conversation_id, {"n": 0})
+    assert store.recent_events(conversation_id)
+
+    store.delete_conversation(conversation_id)
+    assert store.recent_events(conversation_id) == []
+
+
+def test_append_events_stores_batch_in_order(tmp_path):
+    """A batch append stores every event and feeds the recent buffer"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    store.append_event(conversation_id, {"n": 0})
+    assert store.recent_events(conversation_id)
+
+    records = store.append_events(
+        conversation_id,
+        [({"n": 1}, "assistant", "tool"), ({"n": 2}, "assistant", "tool")],
+    )
+    assert [r["payload"]["n"] for r in records] == [1, 2]
+    assert records[0]["id"] < records[1]["id"]
+    assert store.recent_events(conversation_id) == store.list_events(conversation_id)
+    assert store.append_events(conversation_id, []) == []
+
+
+def test_get_conversation_cache_tracks_writes(tmp_path):
+    """Cached conversation records reflect renames, appends and deletes"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="before")["id"]
+    first = store.get_conversation(conversation_id)
+    first["metadata"]["mutated"] = True
+
+    assert store.rename_conversation(conversation_id, "after")["name"] == "after"
+    cached = store.get_conversation(conversation_id)
+    assert cached["name"] == "after"
+    assert "mutated" not in cached["metadata"]
+
+    record = store.append_event(conversation_id, {"n": 0})
+    assert store.get_conversation(conversation_id)["updated_at"] == record["timestamp"]
+
+    store.delete_conversation(conversation_id)
+    assert store.get_conversation(conversation_id) is None
+
+
+def test_recent_events_buffers_are_lru_bounded(tmp_path):
+    """Only the most recently used conversations keep a buffer"""
+    store = _make_store(tmp_path)
+    store.RECENT_EVENTS_MAX_CONVERSATIONS = 2
+    ids = [store.create_conversation(name=f"c{i}")["id"] for i in range(3)]
+    for conversation_id in ids:
+        store.append_event(conversation_id, {"n": 0})
+
+    store.recent_events(ids[0])
+    store.recent_events(ids[1])
+    store.recent_events(ids[0])
+    store.recent_events(ids[2])
+    assert list(store._recent_events) == [ids[0], ids[2]]
+
+    # An evicted conversation is reloaded from the database on demand
+    assert [e["payload"]["n"] for e in store.recent_events(ids[1])] == [0]
+
+
+def test_recent_events_returns_copies(tmp_path):
+    """Mutating returned or appended records doesn't change the buffer"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    store.recent_events(conversation_id)
+    record = store.append_event(conversation_id, {"n": 0})
+    record["payload"]["n"] = 99
+
+    events = store.recent_events(conversation_id)
+    assert events[0]["payload"]["n"] == 0
+    events[0]["payload"]["n"] = 42
+    assert store.recent_events(conversation_id)[0]["payload"]["n"] == 0
+
+
+def test_get_conversation_cache_is_bounded(tmp_path):
+    """The cache holds at most its max size and drops entries found expired"""
+    store = _make_store(tmp_path)
+    store.CONVERSATION_CACHE_MAXSIZE = 2
+    ids = [store.create_conversation(name=f"c{i}")["id"] for i in range(3)]
+    for conversation_id in ids:
+        assert store.get_conversation(conversation_id)["id"] == conversation_id
+    assert list(store._conversation_cache) == ids[1:]
+
+    # Remove a row behind the cache's back; once expired, its entry goes away
+    with store._connection() as conn:
+        conn.execute("DELETE FROM conversations WHERE id = ?", (ids[2],))
+    store.CONVERSATION_CACHE_TTL = 0
+    assert store.get_conversation(ids[2]) is None
+    assert list(store._conversation_cache) == [ids[1]]
+
+
+def test_recent_events_load_does_not_install_stale_snapshot(tmp_path):
+    """A write that lands while a buffer is loading keeps the snapshot out of the cache"""
+    store = _make_store(tmp_path)
+    conversation_id = store.create_conversation(name="recent")["id"]
+    store.append_event(conversation_id, {"n": 0})
+
+    row_to_event = store._row_to_event
+
+    def append_during_load(row):
+        # Runs after the query, outside the buffer lock
+        store._row_to_event = row_to_event
+        store.append_event(conversation_id, {"n": 1})
+        return row_to_event(row)
+
+    store._row_to_event = append_during_load
+    assert [e["payload"]["n"] for e in store.recent_events(conversation_id)] == [0]
+    assert conversation_id not in store._recent_events
+    assert store._recent_loads == {}
+
+    assert [e["payload"]["n"] for e in store.recent_events(conversation_id)] == [0, 1]
+    assert conversation_id in store._recent_events
@@ -0,0 +1,117 @@
+"""
+Unit tests for the WebRTC signaling room's per-peer send queues
+"""
+
+import asyncio
+
+import pytest
+
+from api.webrtc_signaling import PEER_QUEUE_MAXSIZE, signaling_manager
+
+
+class FakeWebSocket:
+    """Records sent frames; sends block while the gate is closed"""
+
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.close_code = None
+        self.fail = fail
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("socket is gone")
+        await self.gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def _settle():
+    """Let the writer tasks run until they block again"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def _room_with_peers(conversation_id: str):
+    room = signaling_manager.get_room(conversation_id)
+    a, b = FakeWebSocket(), FakeWebSocket()
+    await room.register_peer("a", a)
+    await room.register_peer("b", b)
+    return room, a, b
+
+
+@pytest.mark.asyncio
+async def test_relay_preserves_order():
+    """Frames reach the other peer in the order they were relayed"""
+    room, a, b = await _room_with_peers("signaling-order")
+    frames = ["offer", "ice-1", "ice-2", "answer"]
+    for frame in frames:
+        await room.relay_message("a", frame, "offer" if frame == "offer" else "ice-candidate")
+    await _settle()
+
+    assert b.sent == frames
+    assert a.sent == []
+    await room.unregister_peer("a")
+    await room.unregister_peer("b")
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_ice_candidate():
+    """A full queue makes room by dropping its oldest ICE candidate"""
+    room, a, b = await _room_with_peers("signaling-drop-ice")
+    b.gate.clear()
+    await room.relay_message("a", "offer", "offer")
+    await _settle()  # the writer holds the offer, blocked on send
+
+    candidates = [f"ice-{i}" for i in range(PEER_QUEUE_MAXSIZE)]
+    for candidate in candidates:
+        await room.relay_message("a", candidate, "ice-candidate")
+    await room.relay_message("a", "answer", "answer")
+    b.gate.set()
+    await _settle()
+
+    assert b.sent == ["offer"] + candidates[1:] + ["answer"]
+    assert b.close_code is None
+    await room.unregister_peer("a")
+    await room.unregister_peer("b")
+
+
+@pytest.mark.asyncio
+async def test_full_queue_without_ice_closes_peer():
+    """Offers and answers are never dropped; the stalled peer is closed instead"""
+    room, a, b = await _room_with_peers("signaling-close")
+    b.gate.clear()
+    await room.relay_message("a", "offer", "offer")
+    await _settle()
+
+    for i in range(PEER_QUEUE_MAXSIZE):
+        await room.relay_message("a", f"offer-{i}", "offer")
+    await room.relay_message("a", "answer", "answer")
+    # Relays stop going to the stalled peer before its close completes
+    assert room._counterpart == {}
+    assert "b" not in room._queues
+    await _settle()
+
+    assert b.close_code == 1013
+    assert "b" not in room.peers
+    assert b.sent == []
+    await room.unregister_peer("a")
+
+
+@pytest.mark.asyncio
+async def test_failed_writer_unregisters_peer_and_cleans_up_room():
+    """A send failure unregisters the peer and removes the emptied room"""
+    conversation_id = "signaling-failed-writer"
+    room = signaling_manager.get_room(conversation_id)
+    socket = FakeWebSocket(fail=True)
+    await room.register_peer("a", socket)
+
+    room.send_to_peer("a", "hello")
+    await _settle()
+
+    assert "a" not in room.peers
+    assert room._writers == {}
+    assert conversation_id not in signaling_manager.rooms
@@ -1,11 +1,16 @@
+import asyncio
+import functools
 import json
 import os
 import sqlite3
 import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 _DB_LOCK = threading.Lock()
 _CONNECTION_ARGS = dict(check_same_thread=False, isolation_level=None)
@@ -20,11 +25,38 @@ def _utc_now() -> str:
     return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
 
 
+def _copy_conversation(record: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(record, metadata=dict(record["metadata"]))
+
+
+def _copy_event(record: Dict[str, Any]) -> Dict[str, Any]:
+    payload = record["payload"]
+    return dict(record, payload=dict(payload) if isinstance(payload, dict) else payload)
+
+
 class ConversationStore:
     """Simple SQLite-backed store for voice conversations and events."""
 
+    # Number of most recent events kept in memory per conversation
+    RECENT_EVENTS_MAXLEN = 100
+
+    # Conversations whose recent events are kept in memory, least recently used evicted first
+    RECENT_EVENTS_MAX_CONVERSATIONS = 256
+
+    # Seconds a get_conversation() result is served from memory
+    CONVERSATION_CACHE_TTL = 5.0
+
+    # Conversation records cached at most, least recently used evicted first
+    CONVERSATION_CACHE_MAXSIZE = 256
+
     def __init__(self, db_path: Optional[str] = None) -> None:
         self.db_path = db_path or DEFAULT_DB_PATH
+        self._recent_events: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        # Buffer loads in flight; a write to the conversation invalidates its token
+        self._recent_loads: Dict[str, object] = {}
+        self._conversation_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._conversation_lock = threading.Lock()
         self._init_db()
 
     @contextmanager
@@ -122,6 +154,15 @@ class ConversationStore:
         return [self._row_to_conversation(row) for row in rows]
 
     def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._conversation_lock:
+            cached = self._conversation_cache.get(conversation_id)
+            if cached is not None:
+                if now - cached[0] < self.CONVERSATION_CACHE_TTL:
+                    self._conversation_cache.move_to_end(conversation_id)
+                    return _copy_conversation(cached[1])
+                del self._conversation_cache[conversation_id]
+
         with self._connection() as conn:
             row = conn.execute(
                 """
@@ -131,7 +172,15 @@ class ConversationStore:
                 """,
                 (conversation_id,),
             ).fetchone()
-        return self._row_to_conversation(row) if row else None
+        if not row:
+            return None
+        record = self._row_to_conversation(row)
+        with self._conversation_lock:
+            self._conversation_cache[conversation_id] = (now, record)
+            self._conversation_cache.move_to_end(conversation_id)
+            while len(self._conversation_cache) > self.CONVERSATION_CACHE_MAXSIZE:
+                self._conversation_cache.popitem(last=False)
+        return _copy_conversation(record)
 
     def rename_conversation(self, conversation_id: str, name: str) -> Optional[Dict[str, Any]]:
         now = _utc_now()
@@ -146,6 +195,7 @@ class ConversationStore:
             )
             if cursor.rowcount == 0:
                 return None
+        self._forget_conversation(conversation_id)
         return self.get_conversation(conversation_id)
 
     def update_metadata(self, conversation_id: str, metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -161,6 +211,7 @@ class ConversationStore:
             )
             if cursor.rowcount == 0:
                 return None
+        self._forget_conversation(conversation_id)
         return self.get_conversation(conversation_id)
 
     def delete_conversation(self, conversation_id: str) -> bool:
@@ -169,6 +220,8 @@ class ConversationStore:
                 "DELETE FROM conversations WHERE id = ?",
                 (conversation_id,),
             )
+        self._forget_recent_events(conversation_id)
+        self._forget_conversation(conversation_id)
         return cursor.rowcount > 0
 
     def cleanup_inactive_conversations(self, inactive_minutes: int = 30) -> List[str]:
@@ -193,6 +246,9 @@ class ConversationStore:
             deleted_ids = [row[0] for row in rows]
 
             # Delete the conversations (CASCADE will delete events)
+            for conversation_id in deleted_ids:
+                self._forget_recent_events(conversation_id)
+                self._forget_conversation(conversation_id)
             if deleted_ids:
                 placeholders = ",".join("?" * len(deleted_ids))
                 conn.execute(
@@ -230,7 +286,7 @@ class ConversationStore:
                 "UPDATE conversations SET updated_at = ? WHERE id = ?",
                 (ts, conversation_id),
             )
-        return {
+        record = {
             "id": event_id,
             "conversation_id": conversation_id,
             "timestamp": ts,
@@ -238,6 +294,54 @@ class ConversationStore:
             "type": event_type,
             "payload": payload,
         }
+        self._remember_event(record)
+        self._touch_conversation(conversation_id, ts)
+        return record
+
+    def append_events(
+        self,
+        conversation_id: str,
+        events: List[Tuple[Dict[str, Any], Optional[str], Optional[str]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Append several (payload, source, event_type) events in one transaction.
+        Returns the stored records in insertion order.
+        """
+        if not events:
+            return []
+        ts = _utc_now()
+        records: List[Dict[str, Any]] = []
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                for payload, source, event_type in events:
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO conversation_events (conversation_id, timestamp, source, type, payload)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (conversation_id, ts, source, event_type, json.dumps(payload)),
+                    )
+                    records.append({
+                        "id": cursor.lastrowid,
+                        "conversation_id": conversation_id,
+                        "timestamp": ts,
+                        "source": source,
+                        "type": event_type,
+                        "payload": payload,
+                    })
+                conn.execute(
+                    "UPDATE conversations SET updated_at = ? WHERE id = ?",
+                    (ts, conversation_id),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for record in records:
+            self._remember_event(record)
+        self._touch_conversation(conversation_id, ts)
+        return records
 
     def list_events(
         self,
@@ -260,6 +364,88 @@ class ConversationStore:
             rows = conn.execute(sql, tuple(params)).fetchall()
         return [self._row_to_event(row) for row in rows]
 
+    def recent_events(
+        self,
+        conversation_id: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the most recent events of a conversation, oldest first.
+
+        Served from an in-memory ring buffer of the last RECENT_EVENTS_MAXLEN
+        events, which is loaded from the database on first use and kept
+        current by append_event(). Buffers are kept for the
+        RECENT_EVENTS_MAX_CONVERSATIONS most recently used conversations.
+        """
+        limit = self.RECENT_EVENTS_MAXLEN if limit is None else min(limit, self.RECENT_EVENTS_MAXLEN)
+        with self._recent_lock:
+            recent = self._recent_events.get(conversation_id)
+            if recent is not None:
+                self._recent_events.move_to_end(conversation_id)
+                events = list(recent)[-limit:] if limit > 0 else []
+                return [_copy_event(event) for event in events]
+            token = object()
+            self._recent_loads[conversation_id] = token
+
+        # Query without holding the lock so other conversations aren't
+        # blocked behind this load
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, conversation_id, timestamp, source, type, payload
+                    FROM conversation_events WHERE conversation_id = ?
+                    ORDER BY id DESC LIMIT ?
+                    """,
+                    (conversation_id, self.RECENT_EVENTS_MAXLEN),
+                ).fetchall()
+        except Exception:
+            with self._recent_lock:
+                if self._recent_loads.get(conversation_id) is token:
+                    del self._recent_loads[conversation_id]
+            raise
+        loaded = deque(
+            (self._row_to_event(row) for row in reversed(rows)),
+            maxlen=self.RECENT_EVENTS_MAXLEN,
+        )
+
+        with self._recent_lock:
+            if self._recent_loads.get(conversation_id) is token:
+                del self._recent_loads[conversation_id]
+                # Install only if nothing was written meanwhile and no other
+                # load got there first; otherwise just serve this snapshot
+                if conversation_id not in self._recent_events:
+                    self._recent_events[conversation_id] = loaded
+                    while len(self._recent_events) > self.RECENT_EVENTS_MAX_CONVERSATIONS:
+                        self._recent_events.popitem(last=False)
+            events = list(loaded)[-limit:] if limit > 0 else []
+        return [_copy_event(event) for event in events]
+
+    def _remember_event(self, record: Dict[str, Any]) -> None:
+        with self._recent_lock:
+            recent = self._recent_events.get(record["conversation_id"])
+            if recent is None:
+                # A load already in flight may have missed this event
+                self._recent_loads.pop(record["conversation_id"], None)
+            # Skip if the buffer was (re)loaded after this event was inserted
+            elif not recent or recent[-1]["id"] < record["id"]:
+                recent.append(_copy_event(record))
+                self._recent_events.move_to_end(record["conversation_id"])
+
+    def _forget_recent_events(self, conversation_id: str) -> None:
+        with self._recent_lock:
+            self._recent_events.pop(conversation_id, None)
+            self._recent_loads.pop(conversation_id, None)
+
+    def _touch_conversation(self, conversation_id: str, updated_at: str) -> None:
+        with self._conversation_lock:
+            cached = self._conversation_cache.get(conversation_id)
+            if cached is not None:
+                cached[1]["updated_at"] = updated_at
+
+    def _forget_conversation(self, conversation_id: str) -> None:
+        with self._conversation_lock:
+            self._conversation_cache.pop(conversation_id, None)
+
     # ------------------------------------------------------------------
     # Row converters
     # ------------------------------------------------------------------
@@ -303,3 +489,14 @@ class ConversationStore:
 
 
 store = ConversationStore()
+
+# Store calls are blocking SQLite I/O. Async callers run them on this executor
+# so they don't stall the event loop; a single worker keeps writes submitted
+# from the loop in submission order.
+_STORE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="convstore")
+
+
+async def run_store_call(func, *args, **kwargs):
+    """Run a blocking store method off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_STORE_EXECUTOR, functools.partial(func, *args, **kwargs))